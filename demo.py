@@ -118,10 +118,14 @@ print(greet("World"))'''
 async def stream_cmd(args: str):
     """Streaming output demo."""
     text = "This text streams in character by character, simulating an LLM response. "
-    with ui.stream() as s:
+
+    async def generate():
         for char in text:
-            s.write(char)
             await asyncio.sleep(0.02)
+            yield char
+
+    async with ui.stream() as s:
+        await s.write_from(generate())
     ui.print("")
 
 
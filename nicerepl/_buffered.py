@@ -0,0 +1,71 @@
+"""Buffered async iteration for NiceREPL."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncGenerator, AsyncIterable
+from typing import TypeVar
+
+T = TypeVar("T")
+
+
+class _End:
+    """Marks the end of a buffered source, carrying any exception it raised."""
+
+    __slots__ = ("error",)
+
+    def __init__(self, error: BaseException | None) -> None:
+        self.error = error
+
+
+async def buffered(source: AsyncIterable[T], n: int = 1) -> AsyncGenerator[T, None]:
+    """Iterate an async source while prefetching up to `n` items ahead.
+
+    A background task pulls from `source` so the next item is being
+    produced while the consumer handles the current one. Exceptions raised
+    by the source are re-raised in the consumer. Closing the iterator
+    cancels the prefetch and closes the source before returning.
+
+    Example:
+        async for chunk in buffered(llm.stream(prompt)):
+            s.write(chunk)
+    """
+    queue: asyncio.Queue[T | _End] = asyncio.Queue()
+    slots = asyncio.Semaphore(n)
+
+    async def produce() -> None:
+        iterator = aiter(source)
+        try:
+            while True:
+                await slots.acquire()
+                try:
+                    item = await anext(iterator)
+                except StopAsyncIteration:
+                    break
+                queue.put_nowait(item)
+        except BaseException as e:
+            queue.put_nowait(_End(e))
+            if not isinstance(e, Exception):
+                raise
+        else:
+            queue.put_nowait(_End(None))
+        finally:
+            # Shut the source down here rather than leaving it to the GC
+            aclose = getattr(iterator, "aclose", None)
+            if aclose is not None:
+                await aclose()
+
+    producer = asyncio.create_task(produce())
+    try:
+        while True:
+            item = await queue.get()
+            if isinstance(item, _End):
+                if item.error is not None:
+                    raise item.error
+                return
+            slots.release()
+            yield item
+    finally:
+        producer.cancel()
+        # Wait for the source to close before the consumer moves on
+        await asyncio.wait((producer,))
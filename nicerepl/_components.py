@@ -2,8 +2,12 @@
 
 from __future__ import annotations
 
-from rich.console import Group, RenderableType
+import functools
+
+from rich.columns import Columns
+from rich.console import Console, ConsoleOptions, Group, RenderableType, RenderResult
 from rich.padding import Padding
+from rich.segment import Segment
 from rich.syntax import Syntax
 from rich.text import Text
 
@@ -14,7 +18,30 @@ from nicerepl.styles import (
 )
 
 
-class Message:
+class _CachedRenderable:
+    """Base for components whose rendered output can be cached.
+
+    Assigning any public attribute bumps `_version`, so caches keyed on it
+    (such as OutputManager's) pick up changes on the next render (mutating
+    a list attribute in place does not). Subclasses build their Rich tree
+    in `_build()`, which `__rich__` returns.
+    """
+
+    _version = 0  # Bumped whenever a public attribute is assigned
+
+    def __setattr__(self, name: str, value: object) -> None:
+        super().__setattr__(name, value)
+        if not name.startswith("_"):
+            super().__setattr__("_version", self._version + 1)
+
+    def _build(self) -> RenderableType:
+        raise NotImplementedError
+
+    def __rich__(self) -> RenderableType:
+        return self._build()
+
+
+class Message(_CachedRenderable):
     """A structured message with bullet and indented content.
 
     Example:
@@ -34,7 +61,7 @@ class Message:
         self.color = color
         self.icon = icon or ICON_BULLET
 
-    def __rich__(self) -> Text:
+    def _build(self) -> Text:
         text = Text()
         text.append(f"{self.icon} ", style=self.color)
         if self.header:
@@ -49,7 +76,7 @@ class Message:
         return text
 
 
-class CodeBlock:
+class CodeBlock(_CachedRenderable):
     """A syntax-highlighted code block.
 
     Example:
@@ -69,23 +96,56 @@ class CodeBlock:
         self.title = title
         self.line_numbers = line_numbers
 
-    def __rich__(self) -> RenderableType:
-        syntax = Syntax(
-            self.code,
-            self.language,
-            line_numbers=self.line_numbers,
-            word_wrap=True,
-            background_color="default",
-        )
-        padded_syntax = Padding(syntax, (0, 0, 0, 2))
+    def _build(self) -> RenderableType:
+        return _build_code(self.code, self.language, self.line_numbers, self.title)
 
-        if self.title:
-            header = Text(f"  {self.title}", style="dim")
-            return Group(header, padded_syntax)
-        return padded_syntax
 
+class _Prebuilt:
+    """A fixed Rich tree whose rendered segments are cached."""
+
+    def __init__(self, renderable: RenderableType) -> None:
+        self._renderable = renderable
+        self._segment_cache: dict[tuple, list[Segment]] = {}
+
+    def __rich_console__(self, console: Console, options: ConsoleOptions) -> RenderResult:
+        # The console is part of the key: its theme decides the resolved styles
+        key = (console, options.max_width, options.justify, options.overflow, options.no_wrap)
+        segments = self._segment_cache.get(key)
+        if segments is None:
+            segments = list(console.render(self._renderable, options))
+            self._segment_cache[key] = segments
+        return segments
+
+
+@functools.lru_cache(maxsize=128)
+def _build_code(code: str, language: str, line_numbers: bool, title: str | None) -> _Prebuilt:
+    """Build a code block tree, shared by CodeBlocks with identical arguments.
+
+    Pygments tokenization runs when the Syntax is rendered, so sharing the
+    prebuilt tree (and its segment cache) skips re-highlighting.
+    """
+    syntax = Syntax(
+        code,
+        language,
+        line_numbers=line_numbers,
+        word_wrap=True,
+        background_color="default",
+    )
+    padded_syntax = Padding(syntax, (0, 0, 0, 2))
 
-class Status:
+    if title:
+        header = Text(f"  {title}", style="dim")
+        return _Prebuilt(Group(header, padded_syntax))
+    return _Prebuilt(padded_syntax)
+
+
+# Styled "icon " prefix per status, built once
+_STATUS_PREFIX = {
+    name: Text.assemble((f"{icon} ", color)) for name, (color, icon) in STATUS_STYLES.items()
+}
+
+
+class Status(_CachedRenderable):
     """A status badge with icon and message.
 
     Example:
@@ -98,12 +158,13 @@ class Status:
         self.status = status
         self.message = message
 
-    def __rich__(self) -> Text:
-        color, icon = STATUS_STYLES[self.status]
-        return Text.assemble((f"{icon} ", color), self.message)
+    def _build(self) -> Text:
+        text = _STATUS_PREFIX[self.status].copy()
+        text.append(self.message)
+        return text
 
 
-class WelcomeBanner:
+class WelcomeBanner(_CachedRenderable):
     """A customizable startup banner with two-column layout.
 
     Example:
@@ -133,39 +194,27 @@ class WelcomeBanner:
         self.right_sections = right_sections or []
         self.color = color
 
-    def __rich__(self) -> RenderableType:
-        from rich.columns import Columns
-
-        left_parts = []
-
+    def _build_left_column(self) -> RenderableType:
+        parts: list[Text] = []
         if self.greeting:
-            left_parts.append(Text(self.greeting, style="bold"))
-            left_parts.append(Text(""))
-
+            parts += [Text(self.greeting, style="bold"), Text("")]
         if self.ascii_art:
-            art_text = Text(self.ascii_art.strip("\n"), style=self.color)
-            left_parts.append(art_text)
-            left_parts.append(Text(""))
-
-        for info in self.left_info:
-            left_parts.append(Text(info, style="dim"))
-
-        left_column = Group(*left_parts) if left_parts else Text("")
-
-        right_parts = []
+            parts += [Text(self.ascii_art.strip("\n"), style=self.color), Text("")]
+        parts += [Text(info, style="dim") for info in self.left_info]
+        return Group(*parts) if parts else Text("")
 
+    def _build_right_column(self) -> RenderableType:
+        parts: list[Text] = []
         for section_title, items in self.right_sections:
-            right_parts.append(Text(section_title, style=f"bold {self.color}"))
-            for item in items:
-                right_parts.append(Text(f"  {item}"))
-            right_parts.append(Text(""))
-
-        right_column = Group(*right_parts) if right_parts else Text("")
-
-        title_line = Text(f"─ {self.title} ", style="dim") if self.title else None
-
-        columns = Columns([left_column, right_column], padding=(0, 4), expand=True)
-
-        if title_line:
-            return Group(title_line, Text(""), columns)
+            parts.append(Text(section_title, style=f"bold {self.color}"))
+            parts += [Text(f"  {item}") for item in items]
+            parts.append(Text(""))
+        return Group(*parts) if parts else Text("")
+
+    def _build(self) -> RenderableType:
+        # Built on every render, so the tree always reflects the attributes
+        left, right = self._build_left_column(), self._build_right_column()
+        columns = Columns([left, right], padding=(0, 4), expand=True)
+        if self.title:
+            return Group(Text(f"─ {self.title} ", style="dim"), Text(""), columns)
         return columns
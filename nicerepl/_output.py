@@ -2,21 +2,103 @@
 
 from __future__ import annotations
 
-import io
+import asyncio
+import functools
 import os
+import re
+import time
+import weakref
 from collections.abc import Callable
 
-from prompt_toolkit.formatted_text import ANSI
-from prompt_toolkit.shortcuts import print_formatted_text
 from rich.console import Console, RenderableType
+from rich.highlighter import ReprHighlighter
 
+from nicerepl._components import _CachedRenderable
 
+# Minimum seconds between display invalidations (~60 Hz)
+_MIN_INVALIDATE_INTERVAL = 0.016
+
+
+@functools.lru_cache(maxsize=1)
 def _is_dumb_terminal() -> bool:
-    """Check if running in a dumb terminal with limited capabilities."""
+    """Check if running in a dumb terminal with limited capabilities.
+
+    TERM is read once per process; call `cache_clear()` to re-check.
+    """
     term = os.environ.get("TERM", "").lower()
     return term in ("dumb", "")
 
 
+@functools.lru_cache(maxsize=8)
+def _get_console(width: int, dumb: bool) -> Console:
+    """Get a reusable Console for the given width and terminal mode.
+
+    Console construction probes the environment and terminal capabilities,
+    so instances are built once per (width, dumb) pair and reused.
+    """
+    if dumb:
+        # No colors or fancy formatting for dumb terminals
+        return Console(force_terminal=False, no_color=True, width=width)
+    return Console(force_terminal=True, width=width)
+
+
+def _render(content: RenderableType | str, width: int, dumb: bool) -> str:
+    """Render Rich content to an ANSI string at the given width."""
+    console = _get_console(width, dumb)
+    with console.capture() as capture:
+        console.print(content, end="")
+    return capture.get()
+
+
+# Escape and control sequences other than SGR (colors and styles), which is
+# all prompt_toolkit's ANSI() parser keeps. Tab and newline are allowed.
+_UNSAFE_SEQUENCE = re.compile(
+    r"\x1b[\]P_^X][^\x07\x1b]*(?:\x07|\x1b\\)?"  # OSC, DCS, APC, PM, SOS strings
+    r"|\x1b\[(?![0-9;]*m)[0-?]*[ -/]*[@-~]?"  # CSI other than SGR
+    r"|\x1b(?!\[)[ -/]*[0-~]?"  # Other escapes, such as RIS
+    r"|[\x00-\x08\x0b-\x1a\x1c-\x1f\x7f-\x9f]"  # C0 and C1 controls
+)
+
+
+def _strip_unsafe(text: str) -> str:
+    """Remove everything but SGR sequences, tabs and newlines from ANSI text."""
+    return _UNSAFE_SEQUENCE.sub("", text)
+
+
+_highlighter = ReprHighlighter()
+
+
+def _is_plain(text: str, width: int) -> bool:
+    """Check if Rich would render a string as itself.
+
+    True for single-line printable ASCII that fits the width and contains
+    no markup, emoji codes, or anything the default highlighter styles.
+    """
+    if not (text.isascii() and text.isprintable()) or len(text) > width:
+        return False
+    if "[" in text or ":" in text:
+        return False
+    return not _highlighter(text).spans
+
+
+@functools.lru_cache(maxsize=4096)
+def _render_str_cached(text: str, width: int, dumb: bool) -> str:
+    """Render a string to ANSI, memoized since strings are hashable.
+
+    Plain strings skip the Console entirely. Rich renderables are not
+    hashable, so they always go through `_render` directly.
+    """
+    if _is_plain(text, width):
+        return text
+    return _render(text, width, dumb)
+
+
+@functools.lru_cache(maxsize=4096)
+def _format_str_cached(text: str, width: int, dumb: bool, block_spacing: int) -> str:
+    """Render and space a string for output, memoized like `_render_str_cached`."""
+    return _render_str_cached(text, width, dumb).rstrip("\n") + "\n" * block_spacing
+
+
 class OutputManager:
     """Unified output manager for all content.
 
@@ -29,12 +111,30 @@ class OutputManager:
         self._width = width
         self._live_content = ""
         self._live_footer = ""
+        # Newline counts (excluding spacing) so height needs no string work
+        self._live_content_nlines = 0
+        self._live_footer_nlines = 0
+        self._live_combined: str | None = None  # Cached get_live_content()
+        self._live_version = 0  # Bumped on every live content change
+        # Latest set_live() content not yet rendered, and its scheduled render
+        self._pending_live: RenderableType | str | None = None
+        self._live_flush: asyncio.TimerHandle | None = None
+        self._last_live_render = 0.0
+        # ANSI for NiceREPL components, tagged with the component version it was rendered at
+        self._ansi_cache: weakref.WeakKeyDictionary[_CachedRenderable, tuple[int, str]] = (
+            weakref.WeakKeyDictionary()
+        )
         self._invalidate_callback: Callable[[], None] | None = None
+        # Trailing redraw scheduled by _invalidate(), and the loop it runs on
+        self._invalidate_handle: asyncio.TimerHandle | None = None
+        self._invalidate_loop: asyncio.AbstractEventLoop | None = None
+        self._last_invalidate = 0.0
         self._output = None  # Set when app is running
         self._dumb_terminal = _is_dumb_terminal()
 
     def set_invalidate_callback(self, callback: Callable[[], None]) -> None:
         """Set callback to invalidate display when live content changes."""
+        self._cancel_scheduled_invalidate()
         self._invalidate_callback = callback
 
     def set_output(self, output) -> None:
@@ -43,44 +143,143 @@ class OutputManager:
 
     def set_width(self, width: int) -> None:
         """Set the terminal width."""
+        if width != self._width:
+            self._ansi_cache.clear()
         self._width = width
 
     def print(self, content: RenderableType | str) -> None:
-        """Print content to scrollback."""
+        """Print content to scrollback.
+
+        Rich has already produced final ANSI, so when an output device is set
+        the text is written to it raw instead of being re-parsed into
+        prompt_toolkit fragments. Like that parser, only SGR sequences are
+        kept, so printed text cannot move the cursor or reset the terminal.
+        """
+        # Deferred so importing nicerepl does not load prompt_toolkit
+        from prompt_toolkit.application import get_app_or_none, run_in_terminal
+
         formatted = self._format(content)
-        if self._output:
-            print_formatted_text(ANSI(formatted), output=self._output)
-        else:
+        output = self._output
+        if output is None:
+            from prompt_toolkit.formatted_text import ANSI
+            from prompt_toolkit.shortcuts import print_formatted_text
+
             print_formatted_text(ANSI(formatted))
+            return
+
+        # Same newline handling print_formatted_text applies, plus its end="\n"
+        data = _strip_unsafe(formatted).replace("\n", "\r\n") + "\r\n"
+
+        def render() -> None:
+            output.reset_attributes()
+            output.enable_autowrap()
+            output.write_raw(data)
+            output.reset_attributes()
+            output.flush()
+
+        # Print above the running application, as print_formatted_text does
+        app = get_app_or_none()
+        loop = app.loop if app is not None else None
+        if loop is not None:
+            loop.call_soon_threadsafe(lambda: run_in_terminal(render))
+        else:
+            render()
 
     def set_live(self, content: RenderableType | str) -> None:
-        """Set live content (spinner/progress)."""
-        self._live_content = self._format(content)
-        self._invalidate()
+        """Set live content (spinner/progress).
+
+        Rendering is throttled like invalidation: the first update renders
+        immediately, and updates within _MIN_INVALIDATE_INTERVAL of it only
+        keep their content, rendered once by a trailing flush (or earlier,
+        if the live content is read). Intermediate states are dropped.
+        No redraw is triggered when the rendered output is unchanged.
+        """
+        self._pending_live = content
+        if self._live_flush is not None:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self._flush_live()
+            return
+
+        remaining = self._last_live_render + _MIN_INVALIDATE_INTERVAL - time.monotonic()
+        if remaining <= 0:
+            self._flush_live()
+        else:
+            self._live_flush = loop.call_later(remaining, self._flush_live)
+
+    def _flush_live(self) -> None:
+        """Render pending set_live() content, if any."""
+        if self._live_flush is not None:
+            self._live_flush.cancel()
+            self._live_flush = None
+        content = self._pending_live
+        if content is None:
+            return
+        self._pending_live = None
+        self._last_live_render = time.monotonic()
+
+        formatted = self._format(content)
+        if formatted == self._live_content:
+            return
+        self._live_content = formatted
+        self._live_content_nlines = self._live_content.rstrip("\n").count("\n")
+        self._live_changed()
+
+    def _discard_pending_live(self) -> None:
+        """Drop pending set_live() content without rendering it."""
+        self._pending_live = None
+        if self._live_flush is not None:
+            self._live_flush.cancel()
+            self._live_flush = None
 
     def clear_live(self) -> None:
         """Clear main live content."""
+        self._discard_pending_live()
+        if not self._live_content:
+            return
         self._live_content = ""
-        self._invalidate()
+        self._live_content_nlines = 0
+        self._live_changed()
 
     def set_live_footer(self, content: RenderableType | str) -> None:
         """Set persistent footer (e.g., cancelable indicator)."""
-        self._live_footer = self._render_to_ansi(content).rstrip("\n")
-        self._invalidate()
+        footer = self._render_to_ansi(content).rstrip("\n")
+        if footer == self._live_footer:
+            return
+        self._live_footer = footer
+        self._live_footer_nlines = self._live_footer.count("\n")
+        self._live_changed()
 
     def clear_live_footer(self) -> None:
         """Clear the live footer."""
+        if not self._live_footer:
+            return
         self._live_footer = ""
-        self._invalidate()
+        self._live_footer_nlines = 0
+        self._live_changed()
 
     def clear_all_live(self) -> None:
         """Clear both main live content and footer."""
+        self._discard_pending_live()
+        if not (self._live_content or self._live_footer):
+            return
         self._live_content = ""
         self._live_footer = ""
-        self._invalidate()
+        self._live_content_nlines = 0
+        self._live_footer_nlines = 0
+        self._live_changed()
 
     def get_live_content(self) -> str:
         """Get combined live content (main + footer)."""
+        self._flush_live()
+        if self._live_combined is None:
+            self._live_combined = self._join_live()
+        return self._live_combined
+
+    def _join_live(self) -> str:
+        """Join main live content and footer with block spacing."""
         parts = []
         if self._live_content:
             parts.append(self._live_content.rstrip("\n"))
@@ -92,18 +291,38 @@ class OutputManager:
         return ""
 
     def get_live_height(self) -> int:
-        """Get height for live content window."""
-        content = self.get_live_content()
-        if not content:
+        """Get height for live content window.
+
+        Computed from the tracked newline counts, mirroring the layout
+        produced by get_live_content() without building the string.
+        """
+        self._flush_live()
+        if self._live_content and self._live_footer:
+            separator = self.block_spacing + 1
+        elif self._live_content or self._live_footer:
+            separator = 0
+        else:
             return 0
-        return content.count("\n") + 1
+        lines = self._live_content_nlines + self._live_footer_nlines + separator
+        return lines + self.block_spacing + 1
 
     def has_live_content(self) -> bool:
         """Check if there's live content to display."""
+        self._flush_live()
         return bool(self._live_content or self._live_footer)
 
+    def is_live_visible(self) -> bool:
+        """Check if live content would be drawn.
+
+        Live content is only displayed by a running application, which
+        registers the invalidate callback; without one, updates are never seen.
+        """
+        return self._invalidate_callback is not None
+
     def _format(self, content: RenderableType | str) -> str:
         """Single formatting path for ALL content."""
+        if isinstance(content, str):
+            return _format_str_cached(content, self._width, self._dumb_terminal, self.block_spacing)
         ansi = self._render_to_ansi(content)
         return ansi.rstrip("\n") + "\n" * self.block_spacing
 
@@ -111,23 +330,68 @@ class OutputManager:
         """Render Rich content to ANSI string.
 
         Handles graceful degradation for dumb terminals by disabling
-        colors and styles when TERM=dumb or TERM is unset.
+        colors and styles when TERM=dumb or TERM is unset. Plain strings
+        are served from an LRU cache keyed on (text, width, dumb), and
+        NiceREPL components from a per-object cache until they are changed.
         """
-        buffer = io.StringIO()
-        if self._dumb_terminal:
-            # No colors or fancy formatting for dumb terminals
-            console = Console(
-                file=buffer,
-                force_terminal=False,
-                no_color=True,
-                width=self._width,
-            )
-        else:
-            console = Console(file=buffer, force_terminal=True, width=self._width)
-        console.print(content, end="")
-        return buffer.getvalue()
+        if isinstance(content, str):
+            return _render_str_cached(content, self._width, self._dumb_terminal)
+        if isinstance(content, _CachedRenderable):
+            cached = self._ansi_cache.get(content)
+            if cached is not None and cached[0] == content._version:
+                return cached[1]
+            ansi = _render(content, self._width, self._dumb_terminal)
+            self._ansi_cache[content] = (content._version, ansi)
+            return ansi
+        return _render(content, self._width, self._dumb_terminal)
+
+    def _live_changed(self) -> None:
+        """Drop cached live state and schedule a redraw."""
+        self._live_combined = None
+        self._live_version += 1
+        self._invalidate()
+
+    def force_invalidate(self) -> None:
+        """Trigger a display refresh now, bypassing coalescing."""
+        self._do_invalidate()
 
     def _invalidate(self) -> None:
-        """Trigger display refresh."""
+        """Trigger display refresh, coalesced to one per _MIN_INVALIDATE_INTERVAL.
+
+        The first change redraws immediately; changes arriving within the
+        interval are folded into a single trailing redraw. Without a running
+        event loop there is nothing to schedule on, so the refresh is immediate.
+        """
+        if not self._invalidate_callback:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self._do_invalidate()
+            return
+
+        handle = self._invalidate_handle
+        if handle is not None and not handle.cancelled() and self._invalidate_loop is loop:
+            return
+        # Anything left over was scheduled on a loop that stopped before running it
+        self._cancel_scheduled_invalidate()
+
+        remaining = self._last_invalidate + _MIN_INVALIDATE_INTERVAL - time.monotonic()
+        if remaining <= 0:
+            self._do_invalidate()
+        else:
+            self._invalidate_handle = loop.call_later(remaining, self._do_invalidate)
+            self._invalidate_loop = loop
+
+    def _cancel_scheduled_invalidate(self) -> None:
+        """Drop the trailing redraw, if one is scheduled."""
+        if self._invalidate_handle is not None:
+            self._invalidate_handle.cancel()
+            self._invalidate_handle = None
+            self._invalidate_loop = None
+
+    def _do_invalidate(self) -> None:
+        self._cancel_scheduled_invalidate()
+        self._last_invalidate = time.monotonic()
         if self._invalidate_callback:
             self._invalidate_callback()
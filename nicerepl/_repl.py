@@ -3,13 +3,16 @@
 from __future__ import annotations
 
 import asyncio
+import bisect
 import logging
+import operator
 import os
 import shutil
 import sys
 import traceback
-from collections.abc import Awaitable, Callable
-from dataclasses import dataclass
+from collections.abc import Awaitable, Callable, Coroutine
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Literal
 
 # =============================================================================
 # DEBUG MODE
@@ -29,84 +32,59 @@ if _DEBUG:
 else:
     _logger.addHandler(logging.NullHandler())
 
-from prompt_toolkit.application import Application
-from prompt_toolkit.buffer import Buffer
-from prompt_toolkit.completion import Completer, Completion
-from prompt_toolkit.filters import Condition
-from prompt_toolkit.formatted_text import ANSI
-from prompt_toolkit.history import InMemoryHistory
-from prompt_toolkit.key_binding import KeyBindings
-from prompt_toolkit.key_binding.key_processor import KeyPressEvent
-from prompt_toolkit.layout import ConditionalContainer, HSplit, Layout, VSplit, Window
-from prompt_toolkit.layout.controls import BufferControl, FormattedTextControl
-from prompt_toolkit.output.flush_stdout import flush_stdout
-from prompt_toolkit.output.vt100 import Vt100_Output
-from prompt_toolkit.styles import Style
-
 from nicerepl._output import OutputManager
 from nicerepl._ui import ui
 
-
-class _BoundedHistory(InMemoryHistory):
-    """InMemoryHistory with maximum size to prevent unbounded memory growth.
-
-    Keeps the most recent entries, dropping oldest when limit is reached.
-    """
-
-    def __init__(self, max_size: int = 1000) -> None:
-        super().__init__()
-        self._max_size = max_size
-
-    def store_string(self, string: str) -> None:
-        super().store_string(string)
-        # Trim oldest entries if over limit
-        while len(self._storage) > self._max_size:
-            self._storage.pop(0)
+if TYPE_CHECKING:
+    from prompt_toolkit.application import Application
+    from prompt_toolkit.formatted_text import StyleAndTextTuples
+    from prompt_toolkit.key_binding.key_processor import KeyPressEvent
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class _Command:
     """A registered command."""
 
     name: str
     handler: Callable[[str], Awaitable[None]]
     description: str
+    order: int = 0  # Registration position, kept when the command is replaced
+    lower_name: str = field(init=False)  # Name without "/", lowercased for completion
 
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "lower_name", self.name[1:].lower())
 
-class _SyncVt100Output(Vt100_Output):
-    """VT100 output with DEC mode 2026 (synchronized) for flicker-free rendering."""
 
-    def flush(self) -> None:
-        if not self._buffer:
-            return
-        data = "".join(self._buffer)
-        self._buffer = []
-        flush_stdout(self.stdout, "\x1b[?2026h" + data + "\x1b[?2026l")
+_lower_name = operator.attrgetter("lower_name")
+_registration_order = operator.attrgetter("order")
 
+# Inputs kept while a cancel completes; the oldest is dropped beyond this
+_MAX_QUEUED_INPUT = 16
 
-class _CommandCompleter(Completer):
-    """Completer for slash commands."""
+# idle -> handling -> (cancelling ->) idle
+_ReplState = Literal["idle", "handling", "cancelling"]
 
-    def __init__(self, repl: _REPL) -> None:
-        self._repl = repl
 
-    def get_completions(self, document, complete_event):
-        text = document.text_before_cursor.lstrip()
+def _run_event_loop(main: Coroutine[Any, Any, None]) -> None:
+    """Run a coroutine on uvloop when available, else the default asyncio loop.
 
-        if not text.startswith("/"):
+    uvloop is only used on POSIX and only while the default event loop policy
+    is in place, so applications can pick their own loop by installing a
+    policy before calling repl.run().
+    """
+    if (
+        sys.platform != "win32"
+        and type(asyncio.get_event_loop_policy()) is asyncio.DefaultEventLoopPolicy
+    ):
+        try:
+            import uvloop  # type: ignore[import-not-found]
+        except ImportError:
+            pass
+        else:
+            _logger.debug("Using uvloop event loop")
+            uvloop.run(main)
             return
-
-        prefix = text[1:].lower()
-
-        for cmd in self._repl._commands.values():
-            cmd_name = cmd.name[1:]  # Remove leading /
-            if cmd_name.lower().startswith(prefix):
-                yield Completion(
-                    text=cmd_name,
-                    start_position=-len(prefix),
-                    display=cmd.name,
-                    display_meta=cmd.description,
-                )
+    asyncio.run(main)
 
 
 class _REPL:
@@ -114,14 +92,16 @@ class _REPL:
 
     def __init__(self) -> None:
         self._prompt_str = "> "
+        self._prompt_ft: StyleAndTextTuples = [("class:prompt", self._prompt_str)]
         self._commands: dict[str, _Command] = {}
+        self._command_list: list[_Command] = []  # Sorted by lower_name, for completion
         self._input_handler: Callable[[str], Awaitable[None]] | None = None
         self._start_handler: Callable[[], Awaitable[None]] | None = None
         self._error_handler: Callable[[Exception], Awaitable[None]] | None = None
         self._running = False
-        self._handling = False
-        self._cancelling = False  # True while waiting for cancellation to complete
-        self._input_queue: asyncio.Queue[str] = asyncio.Queue()
+        self._state: _ReplState = "idle"  # "cancelling" while waiting for cancel to complete
+        self._input_queue: asyncio.Queue[str] = asyncio.Queue(maxsize=_MAX_QUEUED_INPUT)
+        self._input_dropped = False  # Warned about a full queue since it was drained
         self._current_task: asyncio.Task | None = None
         self._output: OutputManager | None = None
         self._app: Application | None = None
@@ -135,6 +115,11 @@ class _REPL:
     def prompt(self, value: str) -> None:
         """Set the prompt string."""
         self._prompt_str = value
+        self._prompt_ft = [("class:prompt", value)]
+
+    def _get_prompt_ft(self) -> StyleAndTextTuples:
+        """Prompt as formatted text, rebuilt only when the prompt changes."""
+        return self._prompt_ft
 
     @property
     def _out(self) -> OutputManager:
@@ -145,19 +130,25 @@ class _REPL:
 
     def _reset(self) -> None:
         """Reset REPL state for testing. Clears handlers and runtime state."""
-        self._prompt_str = "> "
+        self.prompt = "> "
         self._commands.clear()
+        self._command_list.clear()
         self._input_handler = None
         self._start_handler = None
         self._error_handler = None
         self._running = False
-        self._handling = False
-        self._cancelling = False
-        self._input_queue = asyncio.Queue()
+        self._state = "idle"
+        self._input_queue = asyncio.Queue(maxsize=_MAX_QUEUED_INPUT)
+        self._input_dropped = False
         self._current_task = None
         self._output = None
         self._app = None
 
+    def _set_state(self, state: _ReplState) -> None:
+        """Transition the input state. All changes go through here."""
+        _logger.debug(f"REPL state: {self._state} -> {state}")
+        self._state = state
+
     def on_input(self, func: Callable[[str], Awaitable[None]]) -> Callable[[str], Awaitable[None]]:
         """Decorator to register the main input handler.
 
@@ -211,14 +202,22 @@ class _REPL:
 
         def decorator(func: Callable[[str], Awaitable[None]]) -> Callable[[str], Awaitable[None]]:
             cmd_name = name if name.startswith("/") else f"/{name}"
-            description = func.__doc__ or ""
-            description = description.strip().split("\n")[0]
+            description = (func.__doc__ or "").strip().partition("\n")[0]
 
-            self._commands[cmd_name.lower()] = _Command(
+            key = cmd_name.lower()
+            existing = self._commands.get(key)
+            cmd = _Command(
                 name=cmd_name,
                 handler=func,
                 description=description,
+                order=existing.order if existing is not None else len(self._commands),
             )
+            if existing is not None:
+                i = bisect.bisect_left(self._command_list, cmd.lower_name, key=_lower_name)
+                self._command_list[i] = cmd
+            else:
+                bisect.insort(self._command_list, cmd, key=_lower_name)
+            self._commands[key] = cmd
             return func
 
         return decorator
@@ -230,11 +229,34 @@ class _REPL:
             self._app.exit()
 
     def run(self) -> None:
-        """Run the REPL (sync wrapper around async)."""
-        asyncio.run(self._run_async())
+        """Run the REPL (sync wrapper around async).
+
+        Uses uvloop if it is installed (``pip install nicerepl[uvloop]``).
+        """
+        _run_event_loop(self._run_async())
 
     async def _run_async(self) -> None:
-        """Run the REPL."""
+        """Run the REPL.
+
+        prompt_toolkit is imported here rather than at module level, so that
+        `import nicerepl` stays fast for code that only registers handlers.
+        """
+        from prompt_toolkit.application import Application
+        from prompt_toolkit.buffer import Buffer
+        from prompt_toolkit.filters import Condition
+        from prompt_toolkit.formatted_text import ANSI
+        from prompt_toolkit.key_binding import KeyBindings
+        from prompt_toolkit.layout import ConditionalContainer, HSplit, Layout, VSplit, Window
+        from prompt_toolkit.layout.controls import BufferControl, FormattedTextControl
+        from prompt_toolkit.styles import Style
+
+        from nicerepl._terminal import (
+            _STATUS_TEXT,
+            _BoundedHistory,
+            _CommandCompleter,
+            _SyncVt100Output,
+        )
+
         width = shutil.get_terminal_size().columns
         self._output = OutputManager(block_spacing=1, width=width)
         self._running = True
@@ -275,49 +297,34 @@ class _REPL:
                 return
 
             # Queue input if cancelling (will be processed after cancel completes)
-            if self._cancelling:
+            if self._state == "cancelling":
                 input_buffer.append_to_history()
                 input_buffer.reset()
-                self._input_queue.put_nowait(text)
+                self._queue_input(text)
                 return
 
-            if self._handling:
+            if self._state == "handling":
                 return
 
             input_buffer.append_to_history()
             input_buffer.reset()
 
-            self._handling = True
-
-            async def run_handler() -> None:
-                try:
-                    await self._handle_input(text)
-                except Exception as e:
-                    # Surface errors (CancelledError already handled by cancelable())
-                    if not isinstance(e, asyncio.CancelledError):
-                        ui.error(f"Error: {e}")
-                finally:
-                    self._handling = False
-                    self._cancelling = False
-                    self._current_task = None
-                    # Process any queued input
-                    await self._process_queued_input()
-
-            self._current_task = asyncio.create_task(run_handler())
+            self._set_state("handling")
+            self._current_task = asyncio.create_task(self._run_inputs(text))
 
         @kb.add("escape", eager=True)
         def on_escape(event: KeyPressEvent) -> None:
             """Cancel current operation."""
-            if self._handling and self._current_task and not self._cancelling:
+            if self._state == "handling" and self._current_task:
+                self._set_state("cancelling")  # Wait for cancellation to complete
                 ui.request_cancel()  # UI decides what to do based on mode
-                self._cancelling = True  # Wait for cancellation to complete
 
         @kb.add("c-c", eager=True)
         def on_ctrl_c(event: KeyPressEvent) -> None:
-            if self._handling and not self._cancelling:
+            if self._state == "handling":
+                self._set_state("cancelling")  # Wait for cancellation to complete
                 ui.request_cancel()  # UI decides what to do based on mode
-                self._cancelling = True  # Wait for cancellation to complete
-            elif not self._handling:
+            elif self._state == "idle":
                 input_buffer.text = ""
 
         @kb.add("c-d")
@@ -344,16 +351,19 @@ class _REPL:
         def on_down(event: KeyPressEvent) -> None:
             event.current_buffer.auto_down()
 
-        # Layout
-        def get_separator():
-            return [("class:separator", "─" * width)]
+        # Layout (width is fixed for the session, so the separator is built once)
+        separator: StyleAndTextTuples = [("class:separator", "─" * width)]
 
-        def get_status():
-            return [("class:status", "  ↵ send")]
+        # Parsed live text, reused until the live content version changes
+        live_cache: dict[str, Any] = {"version": -1, "text": ""}
 
         def get_live_text():
-            content = self._out.get_live_content()
-            return ANSI(content) if content else ""
+            version = self._out._live_version
+            if live_cache["version"] != version:
+                content = self._out.get_live_content()
+                live_cache["text"] = ANSI(content) if content else ""
+                live_cache["version"] = version
+            return live_cache["text"]
 
         layout = Layout(
             HSplit(
@@ -365,13 +375,11 @@ class _REPL:
                         ),
                         filter=Condition(self._out.has_live_content),
                     ),
-                    Window(content=FormattedTextControl(get_separator), height=1),
+                    Window(content=FormattedTextControl(separator), height=1),
                     VSplit(
                         [
                             Window(
-                                content=FormattedTextControl(
-                                    lambda: [("class:prompt", self._prompt_str)]
-                                ),
+                                content=FormattedTextControl(self._get_prompt_ft),
                                 width=len(self._prompt_str),
                                 dont_extend_width=True,
                             ),
@@ -379,8 +387,8 @@ class _REPL:
                         ],
                         height=lambda: max(1, input_buffer.document.line_count),
                     ),
-                    Window(content=FormattedTextControl(get_separator), height=1),
-                    Window(content=FormattedTextControl(get_status), height=1),
+                    Window(content=FormattedTextControl(separator), height=1),
+                    Window(content=FormattedTextControl(_STATUS_TEXT), height=1),
                 ]
             )
         )
@@ -407,18 +415,28 @@ class _REPL:
 
         self._out.set_output(output)
         self._out.set_invalidate_callback(self._app.invalidate)
+        ui._start_animator()  # Spinners entered before the display was up
 
-        await self._app.run_async()
+        try:
+            await self._app.run_async()
+        finally:
+            ui._shutdown()
 
     async def _handle_input(self, text: str) -> None:
         """Handle user input."""
         _logger.debug(f"Handling input: {text!r}")
         try:
             # Check if it's a command
-            if text.startswith("/"):
-                parts = text.split(maxsplit=1)
-                cmd_name = parts[0].lower()
-                args = parts[1] if len(parts) > 1 else ""
+            if text[:1] == "/":
+                cmd_name, _, args = text.partition(" ")
+                if cmd_name.isprintable():
+                    args = args.lstrip()
+                else:
+                    # Name ends at other whitespace (e.g. a newline), let split() find it
+                    parts = text.split(maxsplit=1)
+                    cmd_name = parts[0]
+                    args = parts[1] if len(parts) > 1 else ""
+                cmd_name = cmd_name.lower()
 
                 cmd = self._commands.get(cmd_name)
                 if cmd:
@@ -453,23 +471,49 @@ class _REPL:
                 ui.error("Error:")
                 ui.print(f"[red]{traceback.format_exc()}[/red]")
 
-    async def _process_queued_input(self) -> None:
-        """Process any queued input that was submitted during cancellation."""
-        while not self._input_queue.empty():
+    def _queue_input(self, text: str) -> None:
+        """Queue input submitted during cancellation, dropping the oldest if full."""
+        try:
+            self._input_queue.put_nowait(text)
+        except asyncio.QueueFull:
+            self._input_queue.get_nowait()
+            self._input_queue.put_nowait(text)
+            if not self._input_dropped:
+                self._input_dropped = True
+                ui.warning("Too much input while cancelling, dropping the oldest")
+
+    async def _run_inputs(self, text: str) -> None:
+        """Handle input, then any input queued during cancellation, in one task.
+
+        The REPL returns to idle once, after the queue is empty.
+        """
+        batch = [text]
+        try:
+            while batch:
+                for item in batch:
+                    # A cancelled previous item leaves the state at "cancelling"
+                    self._set_state("handling")
+                    try:
+                        await self._handle_input(item)
+                    except Exception as e:
+                        # Surface errors (CancelledError already handled by cancelable())
+                        if not isinstance(e, asyncio.CancelledError):
+                            ui.error(f"Error: {e}")
+                # Input can be queued again if a queued handler is itself cancelled
+                batch = self._drain_input_queue()
+                self._input_dropped = False
+        finally:
+            self._set_state("idle")
+            self._current_task = None
+
+    def _drain_input_queue(self) -> list[str]:
+        """Take everything currently queued, oldest first."""
+        items: list[str] = []
+        while True:
             try:
-                text = self._input_queue.get_nowait()
+                items.append(self._input_queue.get_nowait())
             except asyncio.QueueEmpty:
-                break
-
-            self._handling = True
-            try:
-                await self._handle_input(text)
-            except Exception as e:
-                if not isinstance(e, asyncio.CancelledError):
-                    ui.error(f"Error: {e}")
-            finally:
-                self._handling = False
-                self._cancelling = False
+                return items
 
 
 # =============================================================================
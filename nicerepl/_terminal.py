@@ -0,0 +1,85 @@
+"""prompt_toolkit integration for NiceREPL.
+
+Imported when the REPL starts rather than with the package, since loading
+prompt_toolkit dominates `import nicerepl` time.
+"""
+
+from __future__ import annotations
+
+import bisect
+from collections import deque
+from collections.abc import Iterable, Iterator
+from typing import TYPE_CHECKING
+
+from prompt_toolkit.completion import Completer, Completion
+from prompt_toolkit.formatted_text import StyleAndTextTuples
+from prompt_toolkit.history import InMemoryHistory
+from prompt_toolkit.output.flush_stdout import flush_stdout
+from prompt_toolkit.output.vt100 import Vt100_Output
+
+from nicerepl._repl import _lower_name, _registration_order
+
+if TYPE_CHECKING:
+    from nicerepl._repl import _REPL
+
+_STATUS_TEXT: StyleAndTextTuples = [("class:status", "  ↵ send")]
+
+
+class _BoundedHistory(InMemoryHistory):
+    """InMemoryHistory with maximum size to prevent unbounded memory growth.
+
+    Keeps the most recent entries, dropping oldest when limit is reached.
+    Entries live in a bounded deque, so eviction is O(1).
+    """
+
+    def __init__(self, max_size: int = 1000) -> None:
+        super().__init__()
+        self._max_size = max_size
+        self._entries: deque[str] = deque(maxlen=max_size)
+
+    def load_history_strings(self) -> Iterable[str]:
+        yield from reversed(self._entries)
+
+    def store_string(self, string: str) -> None:
+        self._entries.append(string)
+
+
+class _SyncVt100Output(Vt100_Output):
+    """VT100 output with DEC mode 2026 (synchronized) for flicker-free rendering."""
+
+    def flush(self) -> None:
+        if not self._buffer:
+            return
+        # One join including the markers, so large frames are not copied twice
+        data = "".join(["\x1b[?2026h", *self._buffer, "\x1b[?2026l"])
+        self._buffer = []
+        flush_stdout(self.stdout, data)
+
+
+class _CommandCompleter(Completer):
+    """Completer for slash commands."""
+
+    def __init__(self, repl: _REPL) -> None:
+        self._repl = repl
+
+    def get_completions(self, document, complete_event):
+        # Plain function, so non-command keystrokes create no generator
+        text = document.text_before_cursor.lstrip()
+        if not text.startswith("/"):
+            return iter(())
+        return self._complete(text[1:].lower())
+
+    def _complete(self, prefix: str) -> Iterator[Completion]:
+        # Matches form a contiguous run in the sorted list
+        commands = self._repl._command_list
+        start = end = bisect.bisect_left(commands, prefix, key=_lower_name)
+        while end < len(commands) and commands[end].lower_name.startswith(prefix):
+            end += 1
+        # Offered in the order the commands were registered
+        for cmd in sorted(commands[start:end], key=_registration_order):
+            yield Completion(
+                text=cmd.name[1:],  # Remove leading /
+                start_position=-len(prefix),
+                display=cmd.name,
+                display_meta=cmd.description,
+            )
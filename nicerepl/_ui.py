@@ -10,10 +10,11 @@ This module provides:
 from __future__ import annotations
 
 import asyncio
+import contextlib
 import functools
 import time
-from collections.abc import AsyncIterable, AsyncIterator, Iterable, Iterator
-from contextvars import ContextVar, Token
+from collections.abc import AsyncIterable, AsyncIterator, Callable, Iterable, Iterator
+from contextvars import Context, ContextVar, Token
 from dataclasses import dataclass
 from typing import TYPE_CHECKING, Any, TypeVar
 
@@ -29,6 +30,10 @@ from rich.text import Text
 # Context variable to track the current active cancel scope
 _current_scope: ContextVar[CancelScope | None] = ContextVar("cancel_scope", default=None)
 
+# Entered scopes cancelled but not yet completed. While zero, check_cancelled()
+# can return without looking up the context variable.
+_pending_cancels = 0
+
 
 class CancelScope:
     """Cooperative cancellation scope.
@@ -51,12 +56,22 @@ class CancelScope:
             compute(i)
     """
 
+    __slots__ = (
+        "_cancel_event",
+        "_completed_event",
+        "_task",
+        "_cancel_time",
+        "_sleepers",
+        "_entered",
+    )
+
     def __init__(self) -> None:
         self._cancel_event = asyncio.Event()
         self._completed_event = asyncio.Event()
         self._task: asyncio.Task | None = None
-        self._token: Token | None = None
         self._cancel_time: float | None = None
+        self._sleepers: set[asyncio.Future[bool]] = set()  # Pending sleep() waiters
+        self._entered = False
 
     def cancel(self) -> None:
         """Request cancellation of this scope.
@@ -65,9 +80,14 @@ class CancelScope:
         Cancellation is cooperative - code must check via checkpoint(), sleep(),
         iter(), aiter(), or check_cancelled().
         """
+        global _pending_cancels
         if not self._cancel_event.is_set():
             self._cancel_event.set()
             self._cancel_time = time.monotonic()
+            if self._entered and not self._completed_event.is_set():
+                _pending_cancels += 1
+            for waiter in self._sleepers:
+                _wake(waiter, True)
 
     @property
     def cancelled(self) -> bool:
@@ -79,8 +99,20 @@ class CancelScope:
         """Check if the scope has completed (cleanup finished)."""
         return self._completed_event.is_set()
 
+    def _enter(self) -> None:
+        """Mark this scope as entered. Called by _CancelableContext.__aenter__."""
+        global _pending_cancels
+        if self._entered:
+            return
+        self._entered = True
+        if self._cancel_event.is_set() and not self._completed_event.is_set():
+            _pending_cancels += 1
+
     def _mark_completed(self) -> None:
         """Mark this scope as completed. Called by _CancelableContext.__aexit__."""
+        global _pending_cancels
+        if self._entered and self._cancel_event.is_set() and not self._completed_event.is_set():
+            _pending_cancels -= 1
         self._completed_event.set()
 
     async def wait_completed(self) -> None:
@@ -98,13 +130,20 @@ class CancelScope:
         if self._cancel_event.is_set():
             raise asyncio.CancelledError()
 
+        # A bare future woken by either the timer or cancel(), so no wrapper
+        # task is created the way asyncio.wait_for() would
+        loop = asyncio.get_running_loop()
+        waiter: asyncio.Future[bool] = loop.create_future()
+        handle = loop.call_later(seconds, _wake, waiter, False)
+        self._sleepers.add(waiter)
         try:
-            await asyncio.wait_for(self._cancel_event.wait(), timeout=seconds)
-            # Event was set before timeout expired
+            cancelled = await waiter
+        finally:
+            handle.cancel()
+            self._sleepers.discard(waiter)
+
+        if cancelled:
             raise asyncio.CancelledError()
-        except asyncio.TimeoutError:
-            # Timeout expired = normal sleep completion
-            pass
 
     def iter(self, iterable: Iterable[T]) -> Iterator[T]:
         """Wrap sync iterable to check cancellation each iteration.
@@ -113,19 +152,27 @@ class CancelScope:
             for chunk in scope.iter(large_file):
                 process(chunk)  # Cancellation checked automatically
         """
+        cancelled = self._cancel_event.is_set  # Bound once, checked per item
         for item in iterable:
-            if self._cancel_event.is_set():
+            if cancelled():
                 raise asyncio.CancelledError()
             yield item
 
     async def aiter(self, async_iterable: AsyncIterable[T]) -> AsyncIterator[T]:
         """Wrap async iterable to check cancellation each iteration."""
+        cancelled = self._cancel_event.is_set
         async for item in async_iterable:
-            if self._cancel_event.is_set():
+            if cancelled():
                 raise asyncio.CancelledError()
             yield item
 
 
+def _wake(waiter: asyncio.Future[bool], cancelled: bool) -> None:
+    """Resolve a CancelScope.sleep() waiter unless already resolved."""
+    if not waiter.done():
+        waiter.set_result(cancelled)
+
+
 def check_cancelled() -> None:
     """Check if current operation should cancel. Call in tight loops.
 
@@ -138,6 +185,8 @@ def check_cancelled() -> None:
                 check_cancelled()
             compute(i)
     """
+    if not _pending_cancels:
+        return
     scope = _current_scope.get()
     if scope and scope.cancelled:
         raise asyncio.CancelledError()
@@ -149,31 +198,61 @@ _SLOW_CANCEL_THRESHOLD = 3.0
 
 def _check_slow_cancel(output: OutputManager) -> None:
     """Check if cancel is taking too long and update footer if so."""
-    scope = _current_scope.get()
+    _warn_if_slow_cancel(output, _current_scope.get())
+
+
+def _warn_if_slow_cancel(output: OutputManager, scope: CancelScope | None) -> None:
+    """Update footer if the given scope has been cancelling for too long."""
+    if not _pending_cancels:
+        return
     if scope and scope._cancel_time is not None:
         elapsed = time.monotonic() - scope._cancel_time
         if elapsed >= _SLOW_CANCEL_THRESHOLD:
             output.set_live_footer(Text("(operation slow to cancel...)", style="dim yellow"))
 
 
+def _is_running_in(loop: asyncio.AbstractEventLoop) -> bool:
+    """Check if the caller is running in the given event loop."""
+    try:
+        return asyncio.get_running_loop() is loop
+    except RuntimeError:
+        return False
+
+
+class _Ready:
+    """Awaitable that completes immediately with None."""
+
+    __slots__ = ()
+
+    def __await__(self):
+        return iter(())
+
+
+_READY = _Ready()
+
+
 def _with_checkpoint(f):
     """Decorator that adds checkpoint after method execution.
 
     Works with methods on objects that have a `_ui` attribute pointing to the UI singleton.
-    Calls checkpoint() on the current cancel scope if one is active.
+    The method runs when called; the returned awaitable is the checkpoint() of the
+    current cancel scope, or an already-completed awaitable when no scope is active,
+    so the common case creates no coroutine.
     """
 
     @functools.wraps(f)
-    async def wrapper(self, *args, **kwargs):
-        result = f(self, *args, **kwargs)
-        # Get scope from UI state instead of ContextVar
-        if isinstance(self._ui._state, _CancelableState):
-            await self._ui._state.scope.checkpoint()
-        return result
+    def wrapper(self, *args, **kwargs):
+        f(self, *args, **kwargs)
+        # Get scope from the UI instead of ContextVar
+        scope = self._ui._cancel_scope
+        if scope is None:
+            return _READY
+        return scope.checkpoint()
 
     return wrapper
 
 
+from nicerepl._buffered import buffered
 from nicerepl.styles import (
     COLOR_CANCELLED,
     COLOR_ERROR,
@@ -193,6 +272,8 @@ from nicerepl.styles import (
 )
 
 if TYPE_CHECKING:
+    from rich.progress import ProgressColumn
+
     from nicerepl._output import OutputManager
 
 
@@ -202,14 +283,14 @@ if TYPE_CHECKING:
 # Union type makes invalid states unrepresentable - only one mode at a time
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class _CancelableState:
     """State when inside ui.cancelable() context."""
 
     scope: CancelScope
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class _ConfirmingState:
     """State when waiting for y/n confirm response."""
 
@@ -225,48 +306,42 @@ _UIState = None | _CancelableState | _ConfirmingState
 # =============================================================================
 # These provide the ui.status(), ui.progress(), etc. context manager syntax
 
+# Spinner prefix for each frame, copied and appended to rather than re-assembled
+_SPINNER_PREFIXES = tuple(Text.assemble((f"{c} ", COLOR_SPINNER)) for c in SPINNER_FRAMES)
+
 
 class _StatusContext:
     """Context manager for status spinner."""
 
+    __slots__ = ("_message", "_ui")
+
     def __init__(self, message: str, ui: _UI) -> None:
         self._message = message
         self._ui = ui
-        self._frame = 0
-        self._task: asyncio.Task | None = None
 
     def update(self, message: str) -> None:
         """Update the status message."""
         self._message = message
         self._update_display()
 
+    def _render(self) -> Text:
+        text = _SPINNER_PREFIXES[self._ui._animator_frame].copy()
+        text.append(self._message)
+        return text
+
     def _update_display(self) -> None:
-        frame_char = SPINNER_FRAMES[self._frame % len(SPINNER_FRAMES)]
-        text = Text.assemble(
-            (f"{frame_char} ", COLOR_SPINNER),
-            self._message,
-        )
-        self._ui._out.set_live(text)
+        self._ui._out.set_live(self._render())
 
-    async def _animate(self) -> None:
-        try:
-            while True:
-                await asyncio.sleep(0.08)
-                self._frame = (self._frame + 1) % len(SPINNER_FRAMES)
-                self._update_display()
-                _check_slow_cancel(self._ui._out)
-        except asyncio.CancelledError:
-            pass
+    def _on_tick(self) -> Text:
+        return self._render()
 
     def __enter__(self) -> _StatusContext:
         self._update_display()
-        self._task = asyncio.create_task(self._animate())
+        self._ui._add_animation(self._on_tick)
         return self
 
     def __exit__(self, exc_type: Any, exc_val: Any, exc_tb: Any) -> None:
-        if self._task:
-            self._task.cancel()
-            self._task = None
+        self._ui._remove_animation(self._on_tick)
 
         if exc_type is None:
             text = Text.assemble((f"{ICON_SUCCESS} ", "green"), self._message)
@@ -276,9 +351,48 @@ class _StatusContext:
         self._ui._out.clear_live()
 
 
+@functools.lru_cache(maxsize=16)
+def _progress_columns(
+    show_percentage: bool, show_speed: bool, bar_width: int | None
+) -> tuple[ProgressColumn, ...]:
+    """Build progress bar columns, shared by every bar with the same options.
+
+    These columns keep no per-task state, so one set serves all bars.
+    """
+    from rich.progress import (
+        BarColumn,
+        SpinnerColumn,
+        TaskProgressColumn,
+        TextColumn,
+        TransferSpeedColumn,
+    )
+
+    columns: list[ProgressColumn] = [
+        SpinnerColumn(),
+        TextColumn("[cyan]{task.description}"),
+        BarColumn(bar_width=bar_width),
+    ]
+    if show_percentage:
+        columns.append(TaskProgressColumn())
+    if show_speed:
+        columns.append(TransferSpeedColumn())
+    return tuple(columns)
+
+
 class _ProgressContext:
     """Context manager for progress bar using Rich Progress."""
 
+    __slots__ = (
+        "_description",
+        "_total",
+        "_ui",
+        "_progress",
+        "_task_id",
+        "_bar_half_cells",
+        "_always_render",
+        "_shown",
+    )
+
     def __init__(
         self,
         description: str,
@@ -287,52 +401,57 @@ class _ProgressContext:
         show_percentage: bool = True,
         show_speed: bool = False,
         show_time: bool = False,
-        bar_width: int = 25,
+        bar_width: int | None = 25,
     ) -> None:
-        from rich.progress import (
-            BarColumn,
-            Progress,
-            SpinnerColumn,
-            TaskProgressColumn,
-            TextColumn,
-            TimeRemainingColumn,
-            TransferSpeedColumn,
-        )
+        from rich.progress import Progress, TimeRemainingColumn
 
         self._description = description
         self._total = total
         self._ui = ui
 
-        columns = [
-            SpinnerColumn(),
-            TextColumn("[cyan]{task.description}"),
-            BarColumn(bar_width=bar_width),
-        ]
-        if show_percentage:
-            columns.append(TaskProgressColumn())
-        if show_speed:
-            columns.append(TransferSpeedColumn())
+        columns = _progress_columns(show_percentage, show_speed, bar_width)
         if show_time:
-            columns.append(TimeRemainingColumn())
+            # Caches renders by task ID, which restarts at 0 in every Progress
+            columns += (TimeRemainingColumn(),)
 
         self._progress = Progress(*columns, disable=True)  # Disable auto-refresh
         self._task_id = None
+        self._bar_half_cells = bar_width * 2 if bar_width is not None else 0
+        # Speed and time remaining change without any change in progress, and
+        # a full-width bar (bar_width=None) has no fixed cell count to compare
+        self._always_render = show_speed or show_time or bar_width is None
+        self._shown: tuple[int, int] | None = None  # (percent, bar half-cells) last rendered
 
     def advance(self, amount: float = 1) -> None:
         """Advance progress by the given amount."""
         if self._task_id is None:
             raise RuntimeError("advance() called outside of context manager")
         self._progress.advance(self._task_id, amount)
-        self._update_display()
+        self._update_if_changed()
 
     def update(self, completed: float) -> None:
         """Set absolute progress value."""
         if self._task_id is None:
             raise RuntimeError("update() called outside of context manager")
         self._progress.update(self._task_id, completed=completed)
-        self._update_display()
+        self._update_if_changed()
+
+    def _visible_state(self) -> tuple[int, int]:
+        """Rounded percent and filled bar half-cells, computed as Rich renders them."""
+        task = self._progress.tasks[0]
+        total = task.total
+        if not total:
+            return round(task.percentage), self._bar_half_cells
+        completed = min(total, max(0, task.completed))
+        return round(task.percentage), int(self._bar_half_cells * completed / total)
+
+    def _update_if_changed(self) -> None:
+        """Re-render only when the percentage or filled bar width changes."""
+        if self._always_render or self._visible_state() != self._shown:
+            self._update_display()
 
     def _update_display(self) -> None:
+        self._shown = self._visible_state()
         self._ui._out.set_live(self._progress.get_renderable())
 
     def __enter__(self) -> _ProgressContext:
@@ -352,6 +471,8 @@ class _ProgressContext:
 class _CancelableContext:
     """Async context manager for cancelable operations with cancel scope."""
 
+    __slots__ = ("_ui", "_scope", "_token")
+
     def __init__(self, ui: _UI) -> None:
         self._ui = ui
         self._scope = CancelScope()
@@ -365,20 +486,22 @@ class _CancelableContext:
                 f"Ensure previous context manager has exited."
             )
 
+        # Footer first: if it fails, nothing below needs undoing
+        self._ui._out.set_live_footer(Text("(esc to interrupt)", style="dim"))
         self._ui._state = _CancelableState(scope=self._scope)
         self._scope._task = asyncio.current_task()
-        # Set context variable for check_cancelled() and _check_slow_cancel()
-        self._scope._token = _current_scope.set(self._scope)
-        self._ui._out.set_live_footer(Text("(esc to interrupt)", style="dim"))
+        self._scope._enter()
+        # Set context variable for check_cancelled() and _check_slow_cancel().
+        # Done last, so __aexit__ (which only runs after a successful enter)
+        # always has a token to reset.
+        self._token: Token[CancelScope | None] = _current_scope.set(self._scope)
         return self._scope  # Return scope so users can call scope.sleep()
 
     async def __aexit__(self, exc_type: Any, exc_val: Any, exc_tb: Any) -> bool | None:
         # Signal completion so request_cancel() callers know we're done
         self._scope._mark_completed()
 
-        # Reset context variable
-        if self._scope._token is not None:
-            _current_scope.reset(self._scope._token)
+        _current_scope.reset(self._token)
 
         self._ui._state = None
         self._ui._out.clear_live_footer()
@@ -392,16 +515,17 @@ class _CancelableContext:
 class _ConfirmContext:
     """Blocking confirmation prompt."""
 
+    __slots__ = ("_message", "_ui", "_future")
+
     def __init__(self, message: str, ui: _UI) -> None:
         self._message = message
         self._ui = ui
-        self._result: bool | None = None
-        self._event = asyncio.Event()
+        self._future: asyncio.Future[bool] = asyncio.get_running_loop().create_future()
 
     def respond(self, value: bool) -> None:
-        """Called by key handler to set result."""
-        self._result = value
-        self._event.set()
+        """Called by key handler to set result. Only the first response counts."""
+        if not self._future.done():
+            self._future.set_result(value)
 
     async def wait(self) -> bool:
         """Show prompt and wait for y/n response."""
@@ -423,19 +547,15 @@ class _ConfirmContext:
         )
 
         try:
-            await self._event.wait()
+            result = await self._future
         finally:
             self._ui._state = None
             self._ui._out.clear_live()
 
-        # After event.wait(), respond() must have been called
-        if self._result is None:
-            raise RuntimeError("Confirm event set but no result provided")
-
         # Print result to scrollback
-        icon = ICON_SUCCESS if self._result else ICON_ERROR
-        color = COLOR_SUCCESS if self._result else COLOR_ERROR
-        answer = "yes" if self._result else "no"
+        icon = ICON_SUCCESS if result else ICON_ERROR
+        color = COLOR_SUCCESS if result else COLOR_ERROR
+        answer = "yes" if result else "no"
         self._ui._out.print(
             Text.assemble(
                 (f"{icon} ", color),
@@ -444,14 +564,18 @@ class _ConfirmContext:
             )
         )
 
-        return self._result
+        return result
 
 
 class _StreamContext:
     """Async context manager for streaming text."""
 
+    __slots__ = ("_ui", "_buffer")
+
     def __init__(self, ui: _UI) -> None:
         self._ui = ui
+        # Per context, not pooled on _UI: streams bypass the state machine,
+        # so two can be open at once (e.g. in concurrent tasks)
         self._buffer = ""
 
     def write(self, text: str) -> None:
@@ -463,6 +587,19 @@ class _StreamContext:
         """Append text with newline."""
         self.write(text + "\n")
 
+    async def write_from(self, source: AsyncIterable[str]) -> None:
+        """Append every chunk from an async iterable.
+
+        The next chunk is prefetched while the current one is rendered.
+
+        Example:
+            async with ui.stream() as s:
+                await s.write_from(llm.stream(prompt))
+        """
+        async with contextlib.aclosing(buffered(source)) as chunks:
+            async for chunk in chunks:
+                self.write(chunk)
+
     async def __aenter__(self) -> _StreamContext:
         return self
 
@@ -475,6 +612,8 @@ class _StreamContext:
 class _Task:
     """A live item in a group. Spinner until completed."""
 
+    __slots__ = ("_group", "_text", "_index", "_completed")
+
     def __init__(self, group: _GroupContext, text: str, index: int) -> None:
         self._group = group
         self._text = text
@@ -530,22 +669,46 @@ class _Task:
         self.__exit__(exc_type, exc_val, exc_tb)
 
 
+# Connector prefixes, copied and appended to rather than re-assembled per line
+_PREFIX_MID = Text.assemble((TREE_MID, "dim"))
+_PREFIX_LAST = Text.assemble((TREE_LAST, "dim"))
+# Connector plus spinner for loading items, indexed by [is_last][frame]
+_LOADING_PREFIXES = tuple(
+    tuple(prefix + spinner for spinner in _SPINNER_PREFIXES)
+    for prefix in (_PREFIX_MID, _PREFIX_LAST)
+)
+
+
+@dataclass(slots=True)
+class _GroupItem:
+    """A line in a group, edited in place as its task progresses."""
+
+    text: str
+    icon: str | None = None
+    color: str | None = None
+    is_loading: bool = True
+    line: Text | None = None  # Cached render once finished (None = rebuild)
+
+
 class _GroupContext:
     """Context manager for grouped output with tree brackets."""
 
+    __slots__ = ("_title", "_ui", "_icon", "_items", "_tasks")
+
     def __init__(self, title: str, ui: _UI, icon: str | None = None) -> None:
         self._title = title
         self._ui = ui
         self._icon = icon or ICON_BULLET
-        self._items: list[tuple[str, str | None, str | None, bool]] = []
+        self._items: list[_GroupItem] = []
         self._tasks: list[_Task] = []
-        self._frame = 0
-        self._anim_task: asyncio.Task | None = None
 
     def task(self, text: str) -> _Task:
         """Create a live task with spinner."""
         index = len(self._items)
-        self._items.append((text, None, None, True))
+        if index:
+            # The previous last item's connector changes from └ to ├
+            self._items[index - 1].line = None
+        self._items.append(_GroupItem(text))
         self._update_display()
         t = _Task(self, text, index)
         self._tasks.append(t)
@@ -578,42 +741,70 @@ class _GroupContext:
 
     def _update_task(self, index: int, text: str) -> None:
         """Called by Task.text setter."""
-        old = self._items[index]
-        self._items[index] = (text, old[1], old[2], old[3])
+        item = self._items[index]
+        item.text = text
+        item.line = None
         self._update_display()
 
     def _finish_task(self, index: int, icon: str, color: str, text: str) -> None:
         """Called by Task completion methods."""
-        self._items[index] = (text, icon, color, False)
+        item = self._items[index]
+        item.text = text
+        item.icon = icon
+        item.color = color
+        item.is_loading = False
+        item.line = None
         self._update_display()
 
+    def _bulk_finish(self, icon: str, color: str) -> None:
+        """Complete every unfinished task without redrawing.
+
+        Used on exit, where the live display is about to be replaced by
+        the final render anyway.
+        """
+        for t in self._tasks:
+            if not t._completed:
+                t._completed = True
+                item = self._items[t._index]
+                item.icon = icon
+                item.color = color
+                item.is_loading = False
+                item.line = None
+
+    def _item_line(self, index: int) -> Text:
+        """Get the line for a finished item, building it once."""
+        item = self._items[index]
+        line = item.line
+        if line is None:
+            is_last = index == len(self._items) - 1
+            line = (_PREFIX_LAST if is_last else _PREFIX_MID).copy()
+            if item.icon:
+                line.append(f"{item.icon} ", item.color or "")
+            line.append(item.text, "dim")
+            item.line = line
+        return line
+
     def _update_display(self) -> None:
         """Update live display with current state."""
-        lines = [Text.assemble((f"{self._icon} ", COLOR_SPINNER), self._title)]
+        self._ui._out.set_live(self._render_live())
 
-        for i, (text, icon, color, is_loading) in enumerate(self._items):
-            is_last = i == len(self._items) - 1
-            connector = TREE_LAST if is_last else TREE_MID
+    def _render_live(self) -> Text:
+        """Render the live tree.
 
-            if is_loading:
-                frame = SPINNER_FRAMES[self._frame % len(SPINNER_FRAMES)]
-                line = Text.assemble(
-                    (connector, "dim"),
-                    (f"{frame} ", COLOR_SPINNER),
-                    (text, "dim"),
-                )
-            elif icon:
-                line = Text.assemble(
-                    (connector, "dim"),
-                    (f"{icon} ", color or ""),
-                    (text, "dim"),
-                )
+        Only loading items are rebuilt each frame; finished lines are cached.
+        """
+        lines = [Text.assemble((f"{self._icon} ", COLOR_SPINNER), self._title)]
+
+        for i, item in enumerate(self._items):
+            if item.is_loading:
+                is_last = i == len(self._items) - 1
+                line = _LOADING_PREFIXES[is_last][self._ui._animator_frame].copy()
+                line.append(item.text, "dim")
             else:
-                line = Text.assemble((connector, "dim"), (text, "dim"))
+                line = self._item_line(i)
             lines.append(line)
 
-        content = Text("\n").join(lines)
-        self._ui._out.set_live(content)
+        return Text("\n").join(lines)
 
     def _render_final(self, success: bool, cancelled: bool = False) -> Text:
         """Render final output with correct last-item connector."""
@@ -625,49 +816,28 @@ class _GroupContext:
             icon, color = ICON_ERROR, COLOR_ERROR
 
         lines = [Text.assemble((f"{icon} ", color), self._title)]
-
-        for i, (text, item_icon, item_color, _) in enumerate(self._items):
-            is_last = i == len(self._items) - 1
-            connector = TREE_LAST if is_last else TREE_MID
-
-            if item_icon:
-                line = Text.assemble(
-                    (connector, "dim"),
-                    (f"{item_icon} ", item_color or ""),
-                    (text, "dim"),
-                )
-            else:
-                line = Text.assemble((connector, "dim"), (text, "dim"))
-            lines.append(line)
-
+        lines.extend(self._item_line(i) for i in range(len(self._items)))
         return Text("\n").join(lines)
 
-    async def _animate(self) -> None:
-        """Animate spinners for loading items."""
-        try:
-            while True:
-                await asyncio.sleep(0.08)
-                self._frame = (self._frame + 1) % len(SPINNER_FRAMES)
-                if any(item[3] for item in self._items):
-                    self._update_display()
-                _check_slow_cancel(self._ui._out)
-        except asyncio.CancelledError:
-            pass
+    def _on_tick(self) -> Text | None:
+        """Advance spinners for loading items."""
+        if any(item.is_loading for item in self._items):
+            return self._render_live()
+        return None
 
     def __enter__(self) -> _GroupContext:
         self._update_display()
-        self._anim_task = asyncio.create_task(self._animate())
+        self._ui._add_animation(self._on_tick)
         return self
 
     def __exit__(self, exc_type: Any, exc_val: Any, exc_tb: Any) -> None:
         is_cancelled = exc_type is asyncio.CancelledError
-        for t in self._tasks:
-            if not t._completed:
-                t.cancelled() if is_cancelled else t.error()
+        if is_cancelled:
+            self._bulk_finish(ICON_CANCELLED, COLOR_CANCELLED)
+        else:
+            self._bulk_finish(ICON_ERROR, COLOR_ERROR)
 
-        if self._anim_task:
-            self._anim_task.cancel()
-            self._anim_task = None
+        self._ui._remove_animation(self._on_tick)
         self._ui._out.clear_live()
         final = self._render_final(success=(exc_type is None), cancelled=is_cancelled)
         self._ui._out.print(final)
@@ -679,12 +849,44 @@ class _GroupContext:
 # Main UI singleton providing output methods and context managers
 
 
+def _indent(text: str) -> str:
+    """Indent every line of `text` by two spaces."""
+    return "  " + text.replace("\n", "\n  ")
+
+
+def _count_lines(text: str) -> int:
+    """Count the lines of `text.strip()` without copying the text."""
+    start, end = 0, len(text)
+    while start < end and text[start].isspace():
+        start += 1
+    while end > start and text[end - 1].isspace():
+        end -= 1
+    return text.count("\n", start, end) + 1
+
+
+# Animation callback: returns the context's content for the new frame, or
+# None when it has nothing to animate
+_Animation = Callable[[], RenderableType | None]
+
+# Context for animator callbacks, which read no context variables
+_ANIMATOR_CONTEXT = Context()
+
+# Seconds between spinner frames
+_FRAME_INTERVAL = 0.08
+
+
 class _UI:
     """UI singleton for all output operations."""
 
     def __init__(self) -> None:
         self._output: OutputManager | None = None
-        self._state: _UIState = None  # Union type for UI state
+        self._state_value: _UIState = None  # Read and written through _state
+        self._cancel_scope: CancelScope | None = None  # Scope of a _CancelableState
+        # Shared spinner animation: a chain of timer callbacks ticks every
+        # registered context while there are any
+        self._animations: dict[_Animation, None] = {}  # Ordered set
+        self._animator_handle: asyncio.TimerHandle | None = None
+        self._animator_frame = 0
 
     @property
     def mode(self) -> str:
@@ -700,16 +902,38 @@ class _UI:
 
         Returns True if something was cancelled, False otherwise.
         Use strict=True to raise RuntimeError if nothing to cancel.
+        Safe to call from other threads: the request is handed to the
+        event loop running the cancelable operation.
         """
         if isinstance(self._state, _CancelableState):
-            # Show cancelling footer IMMEDIATELY
-            self._out.set_live_footer(Text("(cancelling...)", style="dim yellow"))
-            self._state.scope.cancel()
+            scope = self._state.scope
+            loop = scope._task.get_loop() if scope._task is not None else None
+            if loop is not None and not _is_running_in(loop):
+                loop.call_soon_threadsafe(self._cancel_active, scope)
+            else:
+                self._cancel_active(scope)
             return True
         if strict:
             raise RuntimeError("Nothing to cancel - not in cancelable mode")
         return False
 
+    def _cancel_active(self, scope: CancelScope) -> None:
+        """Cancel `scope` if it is still the active, unfinished cancelable operation.
+
+        A request handed over from another thread may run after that
+        operation has exited, and must not cancel whichever one came next.
+        """
+        state = self._state
+        if not isinstance(state, _CancelableState) or state.scope is not scope:
+            return
+        # Repeat requests have nothing to add (and would overwrite a slow-cancel warning)
+        if scope.cancelled or scope.completed:
+            return
+        # Show cancelling footer IMMEDIATELY
+        self._out.set_live_footer(Text("(cancelling...)", style="dim yellow"))
+        self._out.force_invalidate()
+        scope.cancel()
+
     def respond_confirm(self, value: bool, *, strict: bool = False) -> bool:
         """Respond to a pending confirmation prompt.
 
@@ -733,6 +957,18 @@ class _UI:
         if self._output is None:
             raise RuntimeError("UI not bound to REPL. Call repl.run() first.")
 
+    @property
+    def _state(self) -> _UIState:
+        """Current UI state (union type)."""
+        return self._state_value
+
+    @_state.setter
+    def _state(self, state: _UIState) -> None:
+        # The active scope is stored alongside, so checkpointed methods read
+        # one attribute instead of inspecting the state
+        self._state_value = state
+        self._cancel_scope = state.scope if isinstance(state, _CancelableState) else None
+
     @property
     def _out(self) -> OutputManager:
         """Get output manager, raising if not bound."""
@@ -744,6 +980,66 @@ class _UI:
         """Reset UI state for testing. Clears output binding and state."""
         self._output = None
         self._state = None
+        self._animations.clear()
+        self._shutdown()
+        self._animator_frame = 0
+
+    def _shutdown(self) -> None:
+        """Stop the animator."""
+        if self._animator_handle is not None:
+            self._animator_handle.cancel()
+            self._animator_handle = None
+
+    def _add_animation(self, callback: _Animation) -> None:
+        """Call `callback` on every spinner frame until removed."""
+        self._animations[callback] = None
+        self._start_animator()
+
+    def _start_animator(self) -> None:
+        """Start ticking registered animations, if any and they can be seen.
+
+        Nothing is scheduled while live content is not displayed (e.g. before
+        the application runs, or in tests); the REPL calls this again once
+        its display is up.
+        """
+        if self._animator_handle is None and self._animations and self._out.is_live_visible():
+            self._schedule_tick()
+
+    def _remove_animation(self, callback: _Animation) -> None:
+        """Stop calling `callback`; the animator stops when none are left."""
+        self._animations.pop(callback, None)
+        if not self._animations:
+            self._shutdown()
+
+    def _schedule_tick(self) -> None:
+        """Schedule the next spinner frame."""
+        self._animator_handle = asyncio.get_running_loop().call_later(
+            _FRAME_INTERVAL, self._tick, context=_ANIMATOR_CONTEXT
+        )
+
+    def _tick(self) -> None:
+        """Advance the shared spinner frame and notify registered contexts."""
+        self._animator_handle = None
+        self._animator_frame = (self._animator_frame + 1) % len(SPINNER_FRAMES)
+        # Keep the frame moving, but skip redrawing what nobody can see
+        if self._out.is_live_visible():
+            self._tick_animations()
+        _warn_if_slow_cancel(self._out, self._cancel_scope)
+        if self._animations:
+            self._schedule_tick()
+
+    def _tick_animations(self) -> None:
+        """Set live content once for this frame.
+
+        The live region holds a single renderable, so only the most recently
+        entered context with something to animate is rendered; the others
+        would be overwritten anyway.
+        """
+        for callback in reversed(self._animations):
+            content = callback()
+            if content is not None:
+                self._out.set_live(content)
+                return
 
     # === Output Methods ===
 
@@ -804,7 +1100,7 @@ class _UI:
         show_percentage: bool = True,
         show_speed: bool = False,
         show_time: bool = False,
-        bar_width: int = 25,
+        bar_width: int | None = 25,
     ) -> _ProgressContext:
         """Create a progress bar context manager.
 
@@ -831,6 +1127,10 @@ class _UI:
             async with ui.stream() as s:
                 async for chunk in generate():
                     s.write(chunk)
+
+            # Or let the stream drive the source, prefetching ahead
+            async with ui.stream() as s:
+                await s.write_from(generate())
         """
         self._check_bound()
         return _StreamContext(self)
@@ -899,35 +1199,31 @@ class _UI:
             ui.collapsed("Details", long_text, max_chars=100)  # Preview
             ui.collapsed("Details", long_text, max_chars=None)  # Full
         """
-        content = content.strip()
-        parts = []
-
-        if max_chars is None:
-            # Show everything
-            parts.append(Text.assemble(("▶ ", style), (title, style)))
-            for line in content.split("\n"):
-                parts.append(Text(f"  {line}", style=style))
-        elif max_chars > 0:
-            # Show truncated preview
-            parts.append(Text.assemble(("▶ ", style), (title, style)))
-            if len(content) > max_chars:
-                preview = content[:max_chars]
-                remaining = len(content) - max_chars
-                parts.append(Text(f"  {preview}...", style=style))
-                parts.append(Text(f"  ({remaining:,} more chars)", style="dim"))
-            else:
-                for line in content.split("\n"):
-                    parts.append(Text(f"  {line}", style=style))
-        else:
+        if max_chars is not None and max_chars <= 0:
             # max_chars=0, just show title + line count
-            line_count = content.count("\n") + 1
-            parts.append(
+            self._out.print(
                 Text.assemble(
                     ("▶ ", style),
                     (title, style),
-                    (f" ({line_count} lines)", "dim"),
+                    (f" ({_count_lines(content)} lines)", "dim"),
                 )
             )
+            return
+
+        content = content.strip()
+        parts = [Text.assemble(("▶ ", style), (title, style))]
+
+        if max_chars is None:
+            # Show everything
+            parts.append(Text(_indent(content), style=style))
+        elif len(content) > max_chars:
+            # Show truncated preview
+            preview = content[:max_chars]
+            remaining = len(content) - max_chars
+            parts.append(Text(f"  {preview}...", style=style))
+            parts.append(Text(f"  ({remaining:,} more chars)", style="dim"))
+        else:
+            parts.append(Text(_indent(content), style=style))
 
         self._out.print(Text("\n").join(parts))
 
@@ -1,19 +1,25 @@
-"""Pytest fixtures for NiceREPL tests."""
+"""Pytest fixtures for NiceREPL tests.
+
+Async tests hand control to the event loop with `asyncio.sleep(0)`. Timed
+sleeps are reserved for tests that depend on real elapsed time, such as
+animation frames and invalidation throttling.
+"""
 
 from __future__ import annotations
 
 import io
 from typing import TYPE_CHECKING
+from unittest.mock import Mock
 
 import pytest
-from rich.console import Console
+from rich.console import Console, RenderableType
 
 from nicerepl._output import OutputManager
 from nicerepl._repl import _REPL
-from nicerepl._ui import _UI
+from nicerepl._ui import _UI, CancelScope, _CancelableState
 
 if TYPE_CHECKING:
-    from collections.abc import Generator
+    from collections.abc import Callable, Generator
 
 
 @pytest.fixture
@@ -33,12 +39,71 @@ def test_console(captured_output: io.StringIO) -> Console:
     )
 
 
+@pytest.fixture(scope="session")
+def render() -> Callable[..., str]:
+    """Render a Rich object to plain text.
+
+    Tests only look for substrings, so no styles or colors are emitted.
+    Consoles are built once per width for the whole session and reused
+    through capture().
+    """
+    consoles: dict[int, Console] = {}
+
+    def _render(renderable: RenderableType, width: int = 80) -> str:
+        console = consoles.get(width)
+        if console is None:
+            console = Console(
+                file=io.StringIO(),
+                width=width,
+                color_system=None,
+                no_color=True,
+                legacy_windows=False,
+            )
+            consoles[width] = console
+        with console.capture() as capture:
+            console.print(renderable, end="")
+        return capture.get()
+
+    return _render
+
+
 @pytest.fixture
 def output_manager() -> OutputManager:
     """Fresh OutputManager instance for testing."""
     return OutputManager(block_spacing=1, width=80)
 
 
+@pytest.fixture
+def mocked_output(output_manager: OutputManager) -> OutputManager:
+    """The test OutputManager with its display methods replaced by mocks."""
+    for name in ("set_live", "print", "clear_live", "set_live_footer", "clear_live_footer"):
+        setattr(output_manager, name, Mock(spec=getattr(OutputManager, name)))
+    return output_manager
+
+
+@pytest.fixture
+def last_printed(mocked_output: OutputManager) -> Callable[[], str]:
+    """Get the text of the most recent mocked print() call."""
+
+    def _last_printed() -> str:
+        return str(mocked_output.print.call_args[0][0])
+
+    return _last_printed
+
+
+@pytest.fixture
+def scope() -> CancelScope:
+    """Fresh CancelScope."""
+    return CancelScope()
+
+
+@pytest.fixture
+def cancelled_scope(scope: CancelScope) -> CancelScope:
+    """CancelScope that has already been cancelled."""
+    scope.cancel()
+    return scope
+
+
 @pytest.fixture
 def test_ui(output_manager: OutputManager) -> Generator[_UI, None, None]:
     """Fresh UI instance bound to test output manager."""
@@ -48,6 +113,13 @@ def test_ui(output_manager: OutputManager) -> Generator[_UI, None, None]:
     ui_instance._reset()
 
 
+@pytest.fixture
+def cancelable_ui(test_ui: _UI, scope: CancelScope) -> _UI:
+    """Test UI put in cancelable mode for `scope`, without entering a context."""
+    test_ui._state = _CancelableState(scope=scope)
+    return test_ui
+
+
 @pytest.fixture
 def test_repl() -> Generator[_REPL, None, None]:
     """Fresh REPL instance for testing."""
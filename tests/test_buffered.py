@@ -0,0 +1,79 @@
+"""Tests for buffered async iteration."""
+
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from nicerepl._buffered import buffered
+
+
+async def numbers(count: int):
+    for i in range(count):
+        await asyncio.sleep(0)
+        yield i
+
+
+class TestBuffered:
+    """Tests for the buffered() async iterator."""
+
+    async def test_yields_all_items_in_order(self) -> None:
+        """Test every item from the source is yielded in order."""
+        result = [item async for item in buffered(numbers(10))]
+        assert result == list(range(10))
+
+    async def test_prefetches_next_item(self) -> None:
+        """Test the next item is produced while the current one is handled."""
+        produced = []
+
+        async def source():
+            for i in range(3):
+                produced.append(i)
+                yield i
+
+        async for item in buffered(source(), n=1):
+            if item == 0:
+                await asyncio.sleep(0)
+                assert produced == [0, 1]
+            break
+
+    async def test_source_exception_propagates(self) -> None:
+        """Test an exception raised by the source reaches the consumer."""
+
+        async def failing():
+            yield 1
+            raise ValueError("boom")
+
+        result = []
+        with pytest.raises(ValueError, match="boom"):
+            async for item in buffered(failing()):
+                result.append(item)
+        assert result == [1]
+
+    async def test_early_exit_cancels_producer(self) -> None:
+        """Test breaking out of the loop stops the background producer."""
+        initial_tasks = asyncio.all_tasks()
+        agen = buffered(numbers(1000))
+        async for _ in agen:
+            break
+        await agen.aclose()
+        await asyncio.sleep(0)
+        assert not asyncio.all_tasks() - initial_tasks
+
+    async def test_aclose_closes_source(self) -> None:
+        """Test closing the iterator closes the source before returning."""
+        closed = []
+
+        async def source():
+            try:
+                for i in range(1000):
+                    yield i
+            finally:
+                closed.append(True)
+
+        agen = buffered(source())
+        async for _ in agen:
+            break
+        await agen.aclose()
+        assert closed == [True]
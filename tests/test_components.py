@@ -3,102 +3,133 @@
 from __future__ import annotations
 
 import io
+from collections.abc import Callable
 
 import pytest
-from rich.console import Console
+from rich.columns import Columns
+from rich.console import Console, Group
+from rich.text import Text
+from rich.theme import Theme
 
 from nicerepl._components import CodeBlock, Message, Status, WelcomeBanner
 
 
-def render_to_string(renderable, width: int = 80) -> str:
-    """Helper to render a Rich object to string."""
-    buffer = io.StringIO()
-    console = Console(file=buffer, force_terminal=True, width=width)
-    console.print(renderable, end="")
-    return buffer.getvalue()
-
-
 class TestMessage:
     """Tests for Message component."""
 
-    def test_simple_message(self) -> None:
-        """Test message without header."""
-        msg = Message("Hello world")
-        output = render_to_string(msg)
-        assert "Hello world" in output
-
-    def test_message_with_header(self) -> None:
-        """Test message with header."""
-        msg = Message("Content here", header="Title")
-        output = render_to_string(msg)
-        assert "Title" in output
-        assert "Content here" in output
-
-    def test_message_custom_icon(self) -> None:
-        """Test message with custom icon."""
-        msg = Message("Test", icon="*")
-        output = render_to_string(msg)
-        assert "*" in output
-
-    def test_multiline_content(self) -> None:
-        """Test message with multiline content."""
-        msg = Message("Line 1\nLine 2\nLine 3", header="Multi")
-        output = render_to_string(msg)
-        assert "Line 1" in output
-        assert "Line 2" in output
-        assert "Line 3" in output
+    @pytest.mark.parametrize(
+        ("content", "kwargs", "expected"),
+        [
+            ("Hello world", {}, ["Hello world"]),
+            ("Content here", {"header": "Title"}, ["Title", "Content here"]),
+            ("Test", {"icon": "*"}, ["*"]),
+            ("Line 1\nLine 2\nLine 3", {"header": "Multi"}, ["Line 1", "Line 2", "Line 3"]),
+        ],
+        ids=["simple", "header", "custom_icon", "multiline"],
+    )
+    def test_message_renders(
+        self, render: Callable[..., str], content: str, kwargs: dict, expected: list[str]
+    ) -> None:
+        """Test message content, header and icon appear in the output."""
+        output = render(Message(content, **kwargs))
+        missing = [text for text in expected if text not in output]
+        assert not missing, missing
+
+    def test_print_end_honoured(self) -> None:
+        """Test console.print(end="") adds no trailing newline, as for a Text."""
+        for component in (Message("hello", header="You"), Status("success", "ok")):
+            console = Console(file=io.StringIO(), width=80)
+            with console.capture() as capture:
+                console.print(component, end="")
+            with console.capture() as expected:
+                console.print(component._build(), end="")
+            assert capture.get() == expected.get()
+            assert not capture.get().endswith("\n")
+
+    def test_assignment_drops_cached_segments(self, render: Callable[..., str]) -> None:
+        """Test assigning a public attribute shows up on the next render."""
+        msg = Message("hello")
+        assert "hello" in render(msg)
+        msg.content = "changed"
+        assert "changed" in render(msg)
+
+    def test_segments_cached_per_console(self) -> None:
+        """Test a console's theme is honoured even after another console rendered."""
+        msg = Message("Themed", color="accent")
+        styles = []
+        for theme in (Theme({"accent": "red"}), Theme({"accent": "blue"})):
+            console = Console(file=io.StringIO(), width=80, theme=theme)
+            segments = list(console.render(msg))
+            styles.append(segments[0].style)
+        assert styles[0] != styles[1]
 
 
 class TestCodeBlock:
     """Tests for CodeBlock component."""
 
-    def test_simple_code(self) -> None:
+    def test_simple_code(self, render: Callable[..., str]) -> None:
         """Test basic code block."""
         code = CodeBlock("print('hello')", language="python")
-        output = render_to_string(code)
+        output = render(code)
         assert "print" in output
         assert "hello" in output
 
-    def test_code_with_title(self) -> None:
+    def test_code_with_title(self, render: Callable[..., str]) -> None:
         """Test code block with title."""
         code = CodeBlock("x = 1", language="python", title="example.py")
-        output = render_to_string(code)
+        output = render(code)
         assert "example.py" in output
 
-    def test_code_no_line_numbers(self) -> None:
+    def test_code_no_line_numbers(self, render: Callable[..., str]) -> None:
         """Test code block without line numbers."""
         code = CodeBlock("x = 1", language="python", line_numbers=False)
-        output = render_to_string(code)
+        output = render(code)
         # Just verify it renders without error
         assert "x" in output and "1" in output
 
+    def test_identical_code_shares_highlighting(self, render: Callable[..., str]) -> None:
+        """Test identical code blocks reuse the same prebuilt tree."""
+        first = CodeBlock("y = 2", language="python")
+        second = CodeBlock("y = 2", language="python")
+        assert first._build() is second._build()
+        assert render(first) == render(second)
+
+    def test_segments_cached_per_width(self, render: Callable[..., str]) -> None:
+        """Test rendered segments are reused for the same width."""
+        code = CodeBlock("z = 3", language="python")
+        first = render(code)
+        assert render(code) == first
+        assert len(code._build()._segment_cache) == 1
+
+        render(code, width=40)
+        assert len(code._build()._segment_cache) == 2
+
 
 class TestStatus:
     """Tests for Status component."""
 
-    def test_success_status(self) -> None:
-        """Test success status."""
-        status = Status("success", "Build completed")
-        output = render_to_string(status)
-        assert "Build completed" in output
-
-    def test_error_status(self) -> None:
-        """Test error status."""
-        status = Status("error", "Test failed")
-        output = render_to_string(status)
-        assert "Test failed" in output
-
-    def test_warning_status(self) -> None:
-        """Test warning status."""
-        status = Status("warning", "Deprecated API")
-        output = render_to_string(status)
-        assert "Deprecated API" in output
-
-    def test_info_status(self) -> None:
-        """Test info status."""
-        status = Status("info", "Version 1.0")
-        output = render_to_string(status)
-        assert "Version 1.0" in output
+    @pytest.mark.parametrize(
+        ("kind", "message"),
+        [
+            ("success", "Build completed"),
+            ("error", "Test failed"),
+            ("warning", "Deprecated API"),
+            ("info", "Version 1.0"),
+        ],
+    )
+    def test_valid_status(self, render: Callable[..., str], kind: str, message: str) -> None:
+        """Test each status kind renders its message."""
+        output = render(Status(kind, message))
+        assert message in output
+
+    def test_message_not_styled_by_prefix(self) -> None:
+        """Test only the icon prefix carries the status color."""
+        first = Status("success", "one")._build()
+        second = Status("success", "two")._build()
+        assert first.plain.endswith("one")
+        assert second.plain.endswith("two")
+        assert not first.style
+        assert all(span.end <= 2 for span in first.spans)
 
     def test_invalid_status(self) -> None:
         """Test invalid status raises error."""
@@ -109,62 +140,69 @@ class TestStatus:
 class TestWelcomeBanner:
     """Tests for WelcomeBanner component."""
 
-    def test_minimal_banner(self) -> None:
-        """Test banner with minimal options."""
-        banner = WelcomeBanner()
-        output = render_to_string(banner)
-        # Should render without error
-        assert output is not None
-
-    def test_banner_with_title(self) -> None:
-        """Test banner with title."""
-        banner = WelcomeBanner(title="MyApp v1.0")
-        output = render_to_string(banner)
-        assert "MyApp v1.0" in output
-
-    def test_banner_with_greeting(self) -> None:
-        """Test banner with greeting."""
-        banner = WelcomeBanner(greeting="Welcome!")
-        output = render_to_string(banner)
-        assert "Welcome!" in output
-
-    def test_banner_with_ascii_art(self) -> None:
-        """Test banner with ASCII art."""
-        banner = WelcomeBanner(ascii_art="  *  \n *** \n*****")
-        output = render_to_string(banner)
-        assert "***" in output
-
-    def test_banner_with_left_info(self) -> None:
-        """Test banner with left info."""
-        banner = WelcomeBanner(left_info=["Line 1", "Line 2"])
-        output = render_to_string(banner)
-        assert "Line 1" in output
-        assert "Line 2" in output
-
-    def test_banner_with_sections(self) -> None:
-        """Test banner with right sections."""
-        banner = WelcomeBanner(
-            right_sections=[
-                ("Commands", ["/help", "/quit"]),
-                ("Tips", ["Press ESC to cancel"]),
-            ]
-        )
-        output = render_to_string(banner)
-        assert "Commands" in output
-        assert "/help" in output
-        assert "Tips" in output
-
-    def test_full_banner(self) -> None:
-        """Test fully configured banner."""
-        banner = WelcomeBanner(
-            title="TestApp",
-            greeting="Hello!",
-            ascii_art="[*]",
-            left_info=["Built with Python"],
-            right_sections=[("Help", ["/help"])],
-            color="blue",
+    @pytest.mark.parametrize(
+        ("kwargs", "expected"),
+        [
+            ({}, []),
+            ({"title": "MyApp v1.0"}, ["MyApp v1.0"]),
+            ({"greeting": "Welcome!"}, ["Welcome!"]),
+            ({"ascii_art": "  *  \n *** \n*****"}, ["***"]),
+            ({"left_info": ["Line 1", "Line 2"]}, ["Line 1", "Line 2"]),
+            (
+                {
+                    "right_sections": [
+                        ("Commands", ["/help", "/quit"]),
+                        ("Tips", ["Press ESC to cancel"]),
+                    ]
+                },
+                ["Commands", "/help", "Tips"],
+            ),
+            (
+                {
+                    "title": "TestApp",
+                    "greeting": "Hello!",
+                    "ascii_art": "[*]",
+                    "left_info": ["Built with Python"],
+                    "right_sections": [("Help", ["/help"])],
+                    "color": "blue",
+                },
+                ["TestApp", "Hello!", "/help"],
+            ),
+        ],
+        ids=["minimal", "title", "greeting", "ascii_art", "left_info", "sections", "full"],
+    )
+    def test_banner_renders(
+        self, render: Callable[..., str], kwargs: dict, expected: list[str]
+    ) -> None:
+        """Test configured banner parts appear in the output."""
+        output = render(WelcomeBanner(**kwargs))
+        missing = [text for text in expected if text not in output]
+        assert not missing, missing
+
+    def test_banner_reflects_assigned_attributes(self, render: Callable[..., str]) -> None:
+        """Test attributes set after construction appear, before and after a render."""
+        banner = WelcomeBanner(title="A")
+        banner.greeting = "Hi there"
+        assert "Hi there" in render(banner)
+
+        banner.title = "B"
+        output = render(banner)
+        assert "─ B" in output
+        assert "─ A" not in output
+
+    def test_banner_styles_fill_column_width(self) -> None:
+        """Test each line's style covers its column padding, not just its text."""
+        banner = WelcomeBanner(greeting="Hi", left_info=["info"])
+        expected = Columns(
+            [Group(Text("Hi", style="bold"), Text(""), Text("info", style="dim")), Text("")],
+            padding=(0, 4),
+            expand=True,
         )
-        output = render_to_string(banner)
-        assert "TestApp" in output
-        assert "Hello!" in output
-        assert "/help" in output
+        outputs = []
+        for renderable in (banner, expected):
+            console = Console(file=io.StringIO(), width=60, force_terminal=True)
+            with console.capture() as capture:
+                console.print(renderable)
+            outputs.append(capture.get())
+        assert outputs[0] == outputs[1]
+        assert "\x1b[2minfo " in outputs[0]
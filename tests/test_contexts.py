@@ -3,10 +3,12 @@
 from __future__ import annotations
 
 import asyncio
-from unittest.mock import MagicMock
+from collections.abc import Callable
 
 import pytest
+from rich.text import Text
 
+from nicerepl._exceptions import StateError
 from nicerepl._output import OutputManager
 from nicerepl._ui import (
     _UI,
@@ -21,180 +23,201 @@ class TestStatusContext:
     so these tests must run in an async context.
     """
 
-    @pytest.mark.asyncio
-    async def test_status_enter_sets_live(
-        self, test_ui: _UI, output_manager: OutputManager
-    ) -> None:
+    async def test_status_enter_sets_live(self, test_ui: _UI, mocked_output: OutputManager) -> None:
         """Test entering status sets live content."""
-        output_manager.set_live = MagicMock()
-
         with test_ui.status("Loading..."):
-            output_manager.set_live.assert_called()
+            mocked_output.set_live.assert_called()
 
-    @pytest.mark.asyncio
     async def test_status_exit_prints_success(
-        self, test_ui: _UI, output_manager: OutputManager
+        self, test_ui: _UI, mocked_output: OutputManager
     ) -> None:
         """Test normal exit prints success."""
-        output_manager.print = MagicMock()
-        output_manager.clear_live = MagicMock()
-
         with test_ui.status("Done"):
             pass
 
-        output_manager.print.assert_called()
-        output_manager.clear_live.assert_called()
+        mocked_output.print.assert_called()
+        mocked_output.clear_live.assert_called()
 
-    @pytest.mark.asyncio
     async def test_status_exit_on_error_prints_error(
-        self, test_ui: _UI, output_manager: OutputManager
+        self, test_ui: _UI, mocked_output: OutputManager
     ) -> None:
         """Test error exit prints error status."""
-        output_manager.print = MagicMock()
-
         with pytest.raises(ValueError), test_ui.status("Working..."):
             raise ValueError("test error")
 
-        output_manager.print.assert_called()
+        mocked_output.print.assert_called()
 
-    @pytest.mark.asyncio
-    async def test_status_update_message(self, test_ui: _UI, output_manager: OutputManager) -> None:
+    async def test_status_update_message(self, test_ui: _UI, mocked_output: OutputManager) -> None:
         """Test updating status message."""
-        output_manager.set_live = MagicMock()
-
         with test_ui.status("First") as s:
             s.update("Second")
             # Should have been called multiple times
-            assert output_manager.set_live.call_count >= 2
+            assert mocked_output.set_live.call_count >= 2
 
 
 class TestProgressContext:
     """Tests for progress bar context manager."""
 
-    def test_progress_enter_sets_live(self, test_ui: _UI, output_manager: OutputManager) -> None:
+    def test_progress_enter_sets_live(self, test_ui: _UI, mocked_output: OutputManager) -> None:
         """Test entering progress sets live content."""
-        output_manager.set_live = MagicMock()
-
         with test_ui.progress("Loading", total=10):
-            output_manager.set_live.assert_called()
+            mocked_output.set_live.assert_called()
 
-    def test_progress_advance(self, test_ui: _UI, output_manager: OutputManager) -> None:
+    def test_progress_advance(self, test_ui: _UI, mocked_output: OutputManager) -> None:
         """Test advancing progress."""
-        output_manager.set_live = MagicMock()
-
         with test_ui.progress("Loading", total=10) as p:
-            initial_calls = output_manager.set_live.call_count
+            initial_calls = mocked_output.set_live.call_count
             p.advance(5)
-            assert output_manager.set_live.call_count > initial_calls
+            assert mocked_output.set_live.call_count > initial_calls
 
-    def test_progress_update(self, test_ui: _UI, output_manager: OutputManager) -> None:
+    def test_progress_update(self, test_ui: _UI, mocked_output: OutputManager) -> None:
         """Test setting absolute progress."""
-        output_manager.set_live = MagicMock()
-
         with test_ui.progress("Loading", total=10) as p:
-            initial_calls = output_manager.set_live.call_count
+            initial_calls = mocked_output.set_live.call_count
             p.update(7)
-            assert output_manager.set_live.call_count > initial_calls
+            assert mocked_output.set_live.call_count > initial_calls
 
-    def test_progress_exit_prints(self, test_ui: _UI, output_manager: OutputManager) -> None:
+    def test_progress_skips_invisible_changes(
+        self, test_ui: _UI, mocked_output: OutputManager
+    ) -> None:
+        """Test advancing re-renders only when the bar visibly changes."""
+        with test_ui.progress("Loading", total=10_000) as p:
+            for _ in range(100):
+                p.advance(1)
+            assert mocked_output.set_live.call_count == 2
+
+    def test_progress_rounds_percentage_like_rich(self, test_ui: _UI) -> None:
+        """Test a change that only moves the rounded percentage is still shown."""
+        with test_ui.progress("Loading", total=1000) as p:
+            p.update(494)
+            assert "49%" in Text.from_ansi(test_ui._out.get_live_content()).plain
+            p.update(496)
+            assert "50%" in Text.from_ansi(test_ui._out.get_live_content()).plain
+
+    def test_progress_speed_always_rerenders(
+        self, test_ui: _UI, mocked_output: OutputManager
+    ) -> None:
+        """Test bars showing speed re-render on every change."""
+        with test_ui.progress("Loading", total=10_000, show_speed=True) as p:
+            for _ in range(10):
+                p.advance(1)
+            assert mocked_output.set_live.call_count == 11
+
+    def test_progress_full_width_bar(self, test_ui: _UI, mocked_output: OutputManager) -> None:
+        """Test a full-width bar (bar_width=None) advances and re-renders each change."""
+        with test_ui.progress("Loading", total=10_000, bar_width=None) as p:
+            for _ in range(10):
+                p.advance(1)
+            assert mocked_output.set_live.call_count == 11
+
+    def test_progress_columns_shared(self, test_ui: _UI) -> None:
+        """Test bars with the same options share columns, except time remaining."""
+        first = test_ui.progress("One", total=10, show_time=True)
+        second = test_ui.progress("Two", total=10, show_time=True)
+        first_columns = first._progress.columns
+        second_columns = second._progress.columns
+        assert first_columns[:-1] == second_columns[:-1]
+        assert first_columns[-1] is not second_columns[-1]
+
+    def test_progress_exit_prints(self, test_ui: _UI, mocked_output: OutputManager) -> None:
         """Test exit prints completion message."""
-        output_manager.print = MagicMock()
-        output_manager.clear_live = MagicMock()
-
         with test_ui.progress("Task", total=10):
             pass
 
-        output_manager.print.assert_called()
-        output_manager.clear_live.assert_called()
+        mocked_output.print.assert_called()
+        mocked_output.clear_live.assert_called()
 
 
 class TestStreamContext:
     """Tests for streaming text context manager."""
 
-    @pytest.mark.asyncio
-    async def test_stream_write(self, test_ui: _UI, output_manager: OutputManager) -> None:
+    async def test_stream_write(self, test_ui: _UI, mocked_output: OutputManager) -> None:
         """Test writing to stream."""
-        output_manager.set_live = MagicMock()
-
         async with test_ui.stream() as s:
             s.write("Hello ")
             s.write("World")
-            assert output_manager.set_live.call_count >= 2
+            assert mocked_output.set_live.call_count >= 2
 
-    @pytest.mark.asyncio
-    async def test_stream_writeln(self, test_ui: _UI, output_manager: OutputManager) -> None:
+    async def test_stream_writeln(self, test_ui: _UI, mocked_output: OutputManager) -> None:
         """Test writeln adds newline."""
-        output_manager.set_live = MagicMock()
-
         async with test_ui.stream() as s:
             s.writeln("Line 1")
             s.writeln("Line 2")
 
-    @pytest.mark.asyncio
+    async def test_stream_write_from(self, test_ui: _UI, last_printed: Callable[[], str]) -> None:
+        """Test write_from appends every chunk of an async iterable."""
+
+        async def chunks():
+            for chunk in ("Hello ", "World"):
+                yield chunk
+
+        async with test_ui.stream() as s:
+            await s.write_from(chunks())
+
+        assert last_printed() == "Hello World"
+
+    async def test_stream_write_from_closes_source_on_error(
+        self, test_ui: _UI, mocked_output: OutputManager
+    ) -> None:
+        """Test the source is closed as soon as writing a chunk fails."""
+        closed = []
+
+        async def chunks():
+            try:
+                for i in range(1000):
+                    yield f"chunk {i}"
+            finally:
+                closed.append(True)
+
+        mocked_output.set_live.side_effect = RuntimeError("render failed")
+        with pytest.raises(RuntimeError, match="render failed"):
+            async with test_ui.stream() as s:
+                await s.write_from(chunks())
+        assert closed == [True]
+
     async def test_stream_exit_prints_buffer(
-        self, test_ui: _UI, output_manager: OutputManager
+        self, test_ui: _UI, mocked_output: OutputManager
     ) -> None:
         """Test exit prints accumulated buffer."""
-        output_manager.print = MagicMock()
-        output_manager.clear_live = MagicMock()
-
         async with test_ui.stream() as s:
             s.write("Content")
 
-        output_manager.print.assert_called()
-        output_manager.clear_live.assert_called()
+        mocked_output.print.assert_called()
+        mocked_output.clear_live.assert_called()
 
 
 class TestCancelableContext:
     """Tests for cancelable async context manager."""
 
-    @pytest.mark.asyncio
-    async def test_cancelable_sets_state(self, test_ui: _UI, output_manager: OutputManager) -> None:
-        """Test entering cancelable sets UI state."""
-        async with test_ui.cancelable():
+    async def test_cancelable_contract(self, test_ui: _UI, mocked_output: OutputManager) -> None:
+        """Test cancelable sets state, shows the hint and yields a scope until exit."""
+        async with test_ui.cancelable() as scope:
             assert isinstance(test_ui._state, _CancelableState)
-
-    @pytest.mark.asyncio
-    async def test_cancelable_clears_state_on_exit(
-        self, test_ui: _UI, output_manager: OutputManager
-    ) -> None:
-        """Test exiting cancelable clears state."""
-        async with test_ui.cancelable():
-            pass
+            mocked_output.set_live_footer.assert_called()
+            assert hasattr(scope, "sleep")
+            assert hasattr(scope, "cancel")
 
         assert test_ui._state is None
 
-    @pytest.mark.asyncio
-    async def test_cancelable_shows_footer(
-        self, test_ui: _UI, output_manager: OutputManager
-    ) -> None:
-        """Test cancelable shows interrupt hint."""
-        output_manager.set_live_footer = MagicMock()
-
-        async with test_ui.cancelable():
-            output_manager.set_live_footer.assert_called()
-
-    @pytest.mark.asyncio
-    async def test_cancelable_returns_scope(
-        self, test_ui: _UI, output_manager: OutputManager
-    ) -> None:
-        """Test cancelable returns CancelScope."""
+    async def test_cancelable_tracks_scope(self, test_ui: _UI) -> None:
+        """Test the active scope is exposed to checkpointed methods."""
         async with test_ui.cancelable() as scope:
-            assert hasattr(scope, "sleep")
-            assert hasattr(scope, "cancel")
+            assert test_ui._cancel_scope is scope
+            with test_ui.group("Work") as g:
+                scope.cancel()
+                with pytest.raises(asyncio.CancelledError):
+                    await g.success("Done")
+
+        assert test_ui._cancel_scope is None
 
-    @pytest.mark.asyncio
     async def test_cancelable_suppresses_cancelled_error(
-        self, test_ui: _UI, output_manager: OutputManager
+        self, test_ui: _UI, mocked_output: OutputManager
     ) -> None:
         """Test cancelable catches and suppresses CancelledError.
 
         Note: We test the __aexit__ behavior directly since CancelScope.cancel()
         also cancels the running task (which would be the test itself).
         """
-        output_manager.print = MagicMock()
-        output_manager.clear_live = MagicMock()
-        output_manager.clear_live_footer = MagicMock()
 
         # Manually test the context manager's exception handling
         ctx = test_ui.cancelable()
@@ -210,17 +233,14 @@ class TestCancelableContext:
         # Should return True (suppress the error)
         assert result is True
         # Should have printed "Interrupted"
-        output_manager.print.assert_called()
+        mocked_output.print.assert_called()
         # State should be cleared
         assert test_ui._state is None
 
-    @pytest.mark.asyncio
     async def test_cancelable_double_enter_raises(
         self, test_ui: _UI, output_manager: OutputManager
     ) -> None:
         """Test nested cancelable raises StateError."""
-        from nicerepl._exceptions import StateError
-
         async with test_ui.cancelable():
             with pytest.raises(StateError, match="already in state"):
                 async with test_ui.cancelable():
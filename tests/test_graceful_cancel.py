@@ -4,14 +4,19 @@ from __future__ import annotations
 
 import asyncio
 import time
+from unittest.mock import MagicMock
 
 import pytest
+from rich.text import Text
 
+from nicerepl import _ui
 from nicerepl._ui import (
     _SLOW_CANCEL_THRESHOLD,
+    _UI,
     CancelScope,
     _check_slow_cancel,
     _current_scope,
+    _warn_if_slow_cancel,
     check_cancelled,
 )
 
@@ -31,25 +36,18 @@ class TestCancelScopeCompletionTracking:
         scope._mark_completed()
         assert scope.completed
 
-    @pytest.mark.asyncio
     async def test_wait_completed_blocks_until_marked(self) -> None:
         """Test wait_completed blocks until _mark_completed is called."""
         scope = CancelScope()
-
-        async def mark_later():
-            await asyncio.sleep(0.05)
-            scope._mark_completed()
-
-        # Start the marking task
-        mark_task = asyncio.create_task(mark_later())
+        wait = asyncio.create_task(scope.wait_completed())
+        await asyncio.sleep(0)  # Let wait_completed() suspend
+        assert not wait.done()
 
         # Wait should complete when mark_completed is called
-        await asyncio.wait_for(scope.wait_completed(), timeout=1.0)
+        asyncio.get_running_loop().call_soon(scope._mark_completed)
+        await asyncio.wait_for(wait, timeout=1.0)
         assert scope.completed
 
-        await mark_task
-
-    @pytest.mark.asyncio
     async def test_wait_completed_returns_immediately_if_already_complete(self) -> None:
         """Test wait_completed returns immediately if already completed."""
         scope = CancelScope()
@@ -96,6 +94,7 @@ class TestCheckCancelled:
     def test_check_cancelled_scope_cancelled(self) -> None:
         """Test check_cancelled raises when scope is cancelled."""
         scope = CancelScope()
+        scope._enter()
         scope.cancel()
         token = _current_scope.set(scope)
         try:
@@ -103,6 +102,28 @@ class TestCheckCancelled:
                 check_cancelled()
         finally:
             _current_scope.reset(token)
+            scope._mark_completed()
+
+    async def test_check_cancelled_fast_path_tracks_pending(self, test_ui: _UI) -> None:
+        """Test the pending-cancel count rises on cancel and falls on completion."""
+        before = _ui._pending_cancels
+        async with test_ui.cancelable() as scope:
+            scope.cancel()
+            assert _ui._pending_cancels == before + 1
+            with pytest.raises(asyncio.CancelledError):
+                check_cancelled()
+        assert _ui._pending_cancels == before
+
+    async def test_pending_count_ignores_unentered_and_completed(self, test_ui: _UI) -> None:
+        """Test only cancels of entered, unfinished scopes are counted."""
+        before = _ui._pending_cancels
+        CancelScope().cancel()
+        assert _ui._pending_cancels == before
+
+        async with test_ui.cancelable() as scope:
+            pass
+        scope.cancel()
+        assert _ui._pending_cancels == before
 
 
 class TestScopeIter:
@@ -131,11 +152,22 @@ class TestScopeIter:
         assert len(result) == 6
         assert result == list(range(6))
 
+    def test_iter_cancellation_latency(self) -> None:
+        """Test iter stops at the very next item deep into a large iterable."""
+        scope = CancelScope()
+        it = scope.iter(range(100_000))
+        for i, _ in enumerate(it):
+            if i == 50_000:
+                scope.cancel()
+                break
+
+        with pytest.raises(asyncio.CancelledError):
+            next(it)
+
 
 class TestScopeAiter:
     """Tests for scope.aiter() async iteration wrapper."""
 
-    @pytest.mark.asyncio
     async def test_aiter_completes_without_cancel(self) -> None:
         """Test aiter completes when not cancelled."""
         scope = CancelScope()
@@ -147,7 +179,6 @@ class TestScopeAiter:
         result = [item async for item in scope.aiter(async_items())]
         assert result == list(range(5))
 
-    @pytest.mark.asyncio
     async def test_aiter_raises_when_cancelled(self) -> None:
         """Test aiter raises CancelledError when scope is cancelled."""
         scope = CancelScope()
@@ -174,8 +205,6 @@ class TestSlowCancelWarning:
 
     def test_check_slow_cancel_no_scope(self) -> None:
         """Test _check_slow_cancel does nothing when no scope is active."""
-        from unittest.mock import MagicMock
-
         mock_output = MagicMock()
         # Should not raise or call set_live_footer
         _check_slow_cancel(mock_output)
@@ -183,8 +212,6 @@ class TestSlowCancelWarning:
 
     def test_check_slow_cancel_not_cancelling(self) -> None:
         """Test _check_slow_cancel does nothing when not cancelling."""
-        from unittest.mock import MagicMock
-
         scope = CancelScope()
         token = _current_scope.set(scope)
         try:
@@ -194,10 +221,18 @@ class TestSlowCancelWarning:
         finally:
             _current_scope.reset(token)
 
+    def test_check_slow_cancel_skipped_without_pending_cancel(self) -> None:
+        """Test no timing check runs while no scope is cancelling."""
+        assert _ui._pending_cancels == 0
+        scope = CancelScope()
+        # A stale cancel time alone does not count as a pending cancel
+        scope._cancel_time = time.monotonic() - _SLOW_CANCEL_THRESHOLD - 1
+        mock_output = MagicMock()
+        _warn_if_slow_cancel(mock_output, scope)
+        mock_output.set_live_footer.assert_not_called()
+
     def test_check_slow_cancel_quick_cancel(self) -> None:
         """Test _check_slow_cancel does nothing for quick cancels."""
-        from unittest.mock import MagicMock
-
         scope = CancelScope()
         scope.cancel()
         token = _current_scope.set(scope)
@@ -209,16 +244,15 @@ class TestSlowCancelWarning:
         finally:
             _current_scope.reset(token)
 
-    def test_check_slow_cancel_slow_cancel(self) -> None:
+    def test_check_slow_cancel_slow_cancel(self, monkeypatch: pytest.MonkeyPatch) -> None:
         """Test _check_slow_cancel shows warning for slow cancels."""
-        from unittest.mock import MagicMock
-
-        from rich.text import Text
-
+        now = 10_000.0
+        monkeypatch.setattr(_ui.time, "monotonic", lambda: now)
         scope = CancelScope()
+        scope._enter()
         scope.cancel()
         # Simulate time passing by setting _cancel_time in the past
-        scope._cancel_time = time.monotonic() - _SLOW_CANCEL_THRESHOLD - 1
+        scope._cancel_time = now - _SLOW_CANCEL_THRESHOLD - 1
 
         token = _current_scope.set(scope)
         try:
@@ -232,6 +266,7 @@ class TestSlowCancelWarning:
             assert "slow to cancel" in str(footer_text)
         finally:
             _current_scope.reset(token)
+            scope._mark_completed()
 
 
 class TestContextVariable:
@@ -9,10 +9,14 @@ Tests for:
 from __future__ import annotations
 
 import asyncio
+import threading
+import time
+from unittest.mock import MagicMock
 
 import pytest
 
 from nicerepl._exceptions import StateError
+from nicerepl.styles import ICON_ERROR, TREE_LAST, TREE_MID
 
 
 class TestStateError:
@@ -104,7 +108,38 @@ class TestBasicContextManagers:
                 await asyncio.sleep(0)
             await g.success("Task 2")
         # Note: group doesn't use _state, just _output
-        await asyncio.sleep(0.05)  # Allow cleanup
+        await asyncio.sleep(0)  # Allow cleanup
+
+    async def test_group_items_added_when_called(self, test_ui):
+        """Checkpointed group methods take effect at call time, await only checkpoints."""
+        with test_ui.group("Test Group") as g:
+            pending = g.info("Note")
+            assert g._items[-1].text == "Note"
+            await pending
+
+    async def test_group_exit_finishes_tasks_without_redraw(self, test_ui):
+        """Unfinished tasks are marked on exit without a live redraw each."""
+        set_live = MagicMock()
+        with pytest.raises(ValueError), test_ui.group("Test Group") as g:
+            tasks = [g.task(f"Task {i}") for i in range(5)]
+            test_ui._out.set_live = set_live
+            raise ValueError("boom")
+
+        set_live.assert_not_called()
+        assert all(t._completed for t in tasks)
+        assert all(item.icon == ICON_ERROR for item in g._items)
+
+    async def test_group_reuses_finished_lines(self, test_ui):
+        """Finished item lines are cached until their connector changes."""
+        with test_ui.group("Test Group") as g:
+            await g.success("First")
+            first = g._item_line(0)
+            g._update_display()
+            assert g._item_line(0) is first
+            assert first.plain.startswith(TREE_LAST)
+
+            with g.task("Second"):
+                assert g._item_line(0).plain.startswith(TREE_MID)
 
     async def test_progress_context_lifecycle(self, test_ui):
         """Progress context enters and exits cleanly."""
@@ -176,6 +211,36 @@ class TestAsyncRaceConditions:
         assert cancelled
         assert test_ui._state is None
 
+    async def test_request_cancel_from_threads(self, test_ui):
+        """Cancel requests from other threads wake the event loop."""
+        async with test_ui.cancelable() as scope:
+            threads = [threading.Timer(0.01, test_ui.request_cancel) for _ in range(8)]
+            for thread in threads:
+                thread.start()
+            start = time.monotonic()
+            with pytest.raises(asyncio.CancelledError):
+                await scope.sleep(10)
+            assert time.monotonic() - start < 1
+            for thread in threads:
+                thread.join()
+
+        assert test_ui._state is None
+
+    async def test_request_cancel_from_thread_after_exit(self, test_ui):
+        """A cross-thread request that lands after its operation exits cancels nothing."""
+        async with test_ui.cancelable() as first:
+            # The handoff cannot run until this task yields, which is after exit
+            thread = threading.Thread(target=test_ui.request_cancel)
+            thread.start()
+            thread.join()
+
+        async with test_ui.cancelable() as second:
+            await asyncio.sleep(0)
+            await asyncio.sleep(0)
+            assert not second.cancelled
+
+        assert not first.cancelled
+
     async def test_request_cancel_outside_cancelable(self, test_ui):
         """request_cancel outside cancelable mode returns False."""
         assert test_ui._state is None
@@ -197,17 +262,17 @@ class TestAsyncRaceConditions:
         """Verify animation tasks are cleaned up after cancel."""
         initial_tasks = len(asyncio.all_tasks())
 
-        async with test_ui.cancelable():
+        async with test_ui.cancelable() as scope:
             with test_ui.status("Working..."):
-                await asyncio.sleep(0.05)  # Let animation start
+                await asyncio.sleep(0)
                 test_ui.request_cancel()
                 try:
-                    await asyncio.sleep(10)
+                    await scope.sleep(10)  # Interrupted by the cancel
                 except asyncio.CancelledError:
                     pass
 
         # Allow cleanup
-        await asyncio.sleep(0.1)
+        await asyncio.sleep(0)
 
         final_tasks = len(asyncio.all_tasks())
         # Allow for pytest's own tasks
@@ -218,10 +283,10 @@ class TestAsyncRaceConditions:
         initial_tasks = len(asyncio.all_tasks())
 
         with pytest.raises(ValueError), test_ui.status("Working..."):
-            await asyncio.sleep(0.05)  # Let animation start
+            await asyncio.sleep(0)
             raise ValueError("Test error")
 
-        await asyncio.sleep(0.1)
+        await asyncio.sleep(0)
         final_tasks = len(asyncio.all_tasks())
         assert final_tasks <= initial_tasks + 1
 
@@ -229,11 +294,11 @@ class TestAsyncRaceConditions:
         """Exception during group context should clean up."""
         with pytest.raises(ValueError), test_ui.group("Test") as g:
             g.task("Task 1")
-            await asyncio.sleep(0.05)
+            await asyncio.sleep(0)
             raise ValueError("Test error")
 
         # State should be clean (group doesn't use _state)
-        await asyncio.sleep(0.1)
+        await asyncio.sleep(0)
 
     async def test_cancel_during_group(self, test_ui):
         """Cancellation during group should mark tasks as cancelled."""
@@ -2,9 +2,23 @@
 
 from __future__ import annotations
 
+import asyncio
+import io
+import time
+from unittest.mock import Mock
+
+from prompt_toolkit.data_structures import Size
+from prompt_toolkit.output.vt100 import Vt100_Output
 from rich.text import Text
 
-from nicerepl._output import OutputManager
+from nicerepl._components import Message
+from nicerepl._output import (
+    OutputManager,
+    _format_str_cached,
+    _is_plain,
+    _render,
+    _render_str_cached,
+)
 
 
 class TestOutputManager:
@@ -38,6 +52,40 @@ class TestOutputManager:
         assert result.endswith("\n")
         assert "Hello" in result
 
+    def test_plain_fast_path_matches_rich(self) -> None:
+        """Test strings taking the fast path render as Rich would."""
+        for text in ["", "hello world", "  padded  ", "a" * 80]:
+            assert _is_plain(text, 80)
+            assert _render(text, 80, False) == text
+        for text in ["a" * 81, "[bold]x[/bold]", "x = 1", ":smile:", "caf\u00e9", "a\nb"]:
+            assert not _is_plain(text, 80)
+
+    def test_format_string_cached(self) -> None:
+        """Test repeated string formats are served from the cache."""
+        om = OutputManager(block_spacing=2, width=80)
+        _format_str_cached.cache_clear()
+        first = om._format("Hello")
+        assert om._format("Hello") is first
+        assert first.endswith("\n\n")
+        assert _format_str_cached.cache_info().hits == 1
+
+    def test_component_render_cached_per_object(self) -> None:
+        """Test components are rendered once per object and width."""
+        om = OutputManager(width=80)
+        message = Message("Hello", header="You")
+        first = om._render_to_ansi(message)
+        assert om._render_to_ansi(message) is first
+        assert message in om._ansi_cache
+
+        message.content = "Changed"
+        assert "Changed" in om._render_to_ansi(message)
+
+        om.set_width(40)
+        assert message not in om._ansi_cache
+
+        del message
+        assert len(om._ansi_cache) == 0
+
     def test_format_rich_text(self) -> None:
         """Test formatting Rich Text object."""
         om = OutputManager(block_spacing=1, width=80)
@@ -45,6 +93,38 @@ class TestOutputManager:
         result = om._format(text)
         assert "Hello" in result
 
+    def test_render_str_cached(self) -> None:
+        """Test repeated string renders are served from the cache."""
+        om = OutputManager(block_spacing=1, width=80)
+        _render_str_cached.cache_clear()
+        first = om._render_to_ansi("[bold]Hello[/bold]")
+        second = om._render_to_ansi("[bold]Hello[/bold]")
+        assert first == second
+        assert _render_str_cached.cache_info().hits == 1
+
+    def test_print_writes_raw_ansi(self) -> None:
+        """Test print writes Rich's ANSI straight to the output device."""
+        stdout = io.StringIO()
+        om = OutputManager(block_spacing=1, width=80)
+        om.set_output(Vt100_Output(stdout, lambda: Size(rows=24, columns=80)))
+
+        om.print(Text("Hello", style="bold"))
+        written = stdout.getvalue()
+        assert "\x1b[1mHello\x1b[0m\r\n" in written
+
+    def test_print_strips_non_sgr_sequences(self) -> None:
+        """Test printed text cannot send terminal control sequences."""
+        output = Mock(spec=Vt100_Output)
+        om = OutputManager(block_spacing=1, width=80)
+        om.set_output(output)
+
+        om.print(Text("clear\x1b[2Jx \x1bcreset \x1b]0;title\x07 \x1b[?25lhide", style="bold"))
+        written = "".join(call.args[0] for call in output.write_raw.call_args_list)
+        for sequence in ("\x1b[2J", "\x1bc", "\x1b]", "\x1b[?25l", "\x07"):
+            assert sequence not in written
+        assert written.startswith("\x1b[1mclearx reset")
+        assert "hide\x1b[0m" in written
+
     def test_set_live_content(self) -> None:
         """Test setting live content."""
         om = OutputManager()
@@ -121,6 +201,41 @@ class TestOutputManager:
         height = om.get_live_height()
         assert height >= 3
 
+    def test_get_live_height_matches_content(self) -> None:
+        """Test tracked height agrees with the combined live content."""
+        om = OutputManager(block_spacing=2)
+        om.set_live("Line 1\nLine 2")
+        om.set_live_footer("Footer")
+        assert om.get_live_height() == om.get_live_content().count("\n") + 1
+
+        om.clear_live()
+        assert om.get_live_height() == om.get_live_content().count("\n") + 1
+
+    def test_get_live_content_cached(self) -> None:
+        """Test combined live content is reused until a setter runs."""
+        om = OutputManager()
+        om.set_live("Main")
+        first = om.get_live_content()
+        assert om.get_live_content() is first
+
+        om.set_live_footer("Footer")
+        assert "Footer" in om.get_live_content()
+
+    def test_live_version_bumped_on_change(self) -> None:
+        """Test the live version changes only when live content does."""
+        om = OutputManager()
+        version = om._live_version
+
+        om.set_live("Main")
+        assert om._live_version == version + 1
+
+        om.set_live("Main")
+        om.clear_live_footer()
+        assert om._live_version == version + 1
+
+        om.clear_all_live()
+        assert om._live_version == version + 2
+
     def test_invalidate_callback(self) -> None:
         """Test invalidate callback is called on changes."""
         om = OutputManager()
@@ -139,6 +254,96 @@ class TestOutputManager:
         om.clear_live_footer()
         assert len(calls) == 4
 
+        om.set_live("test")
+        om.set_live_footer("footer")
+        om.clear_all_live()
+        assert len(calls) == 7
+
+    def test_unchanged_live_content_skips_invalidate(self) -> None:
+        """Test setting identical live content does not trigger a redraw."""
+        om = OutputManager()
+        calls = []
+        om.set_invalidate_callback(lambda: calls.append(1))
+
+        om.set_live(Text("Spinner"))
+        om.set_live(Text("Spinner"))
+        assert len(calls) == 1
+
+        om.set_live_footer("footer")
+        om.set_live_footer("footer")
+        assert len(calls) == 2
+
+    def test_clearing_empty_live_skips_invalidate(self) -> None:
+        """Test clearing already-empty live content does not trigger a redraw."""
+        om = OutputManager()
+        calls = []
+        om.set_invalidate_callback(lambda: calls.append(1))
+
+        om.clear_live()
+        om.clear_live_footer()
+        om.clear_all_live()
+        assert calls == []
+
+        om.set_live("test")
+        om.clear_all_live()
+        om.clear_all_live()
+        assert len(calls) == 2
+
+    async def test_invalidate_coalesced(self) -> None:
+        """Test rapid changes fold into a leading and a trailing redraw."""
+        om = OutputManager()
+        calls = []
+        om.set_invalidate_callback(lambda: calls.append(1))
+
+        for i in range(100):
+            om.set_live(f"Progress {i}")
+        assert len(calls) == 1
+
+        await asyncio.sleep(0.05)
+        assert len(calls) == 2
+
+        om.force_invalidate()
+        assert len(calls) == 3
+
+    def test_invalidate_recovers_after_loop_stops(self) -> None:
+        """Test a trailing redraw dropped with its loop does not block later ones."""
+        om = OutputManager()
+        calls = []
+        om.set_invalidate_callback(lambda: calls.append(1))
+
+        async def change(*footers: str) -> None:
+            for footer in footers:
+                om.set_live_footer(footer)
+
+        # The second change schedules a trailing redraw that never runs
+        asyncio.run(change("one", "two"))
+        assert len(calls) == 1
+
+        time.sleep(0.05)
+        asyncio.run(change("three"))
+        assert len(calls) == 2
+
+    async def test_set_live_throttles_rendering(self) -> None:
+        """Test bursts of live updates render only the first and latest content."""
+        om = OutputManager()
+        rendered: list[object] = []
+        format_content = om._format
+        om._format = lambda content: (rendered.append(content), format_content(content))[1]  # type: ignore[method-assign]
+
+        for i in range(100):
+            om.set_live(f"Progress {i}")
+        assert rendered == ["Progress 0"]
+
+        # Reading the live content renders what is pending
+        assert "Progress 99" in Text.from_ansi(om.get_live_content()).plain
+        assert rendered == ["Progress 0", "Progress 99"]
+
+        om.set_live("Done")
+        om.clear_live()
+        await asyncio.sleep(0.05)
+        assert not om.has_live_content()
+        assert "Done" not in rendered
+
     def test_invalidate_no_callback(self) -> None:
         """Test no error when invalidate called without callback."""
         om = OutputManager()
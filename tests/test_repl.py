@@ -2,7 +2,17 @@
 
 from __future__ import annotations
 
-from nicerepl._repl import _REPL, _Command
+import asyncio
+import io
+
+from prompt_toolkit.completion import CompleteEvent
+from prompt_toolkit.data_structures import Size
+from prompt_toolkit.document import Document
+
+from nicerepl._output import OutputManager
+from nicerepl._repl import _MAX_QUEUED_INPUT, _REPL, _Command, _run_event_loop
+from nicerepl._terminal import _BoundedHistory, _CommandCompleter, _SyncVt100Output
+from nicerepl._ui import ui
 
 
 class TestCommandRegistration:
@@ -94,6 +104,107 @@ class TestCommandRegistration:
         assert "/mycommand" in test_repl._commands
 
 
+async def _noop(args: str) -> None:
+    pass
+
+
+class TestCommandCompleter:
+    """Tests for slash command completion."""
+
+    def _complete(self, repl: _REPL, text: str) -> list[str]:
+        completer = _CommandCompleter(repl)
+        return [c.text for c in completer.get_completions(Document(text), CompleteEvent())]
+
+    def test_completes_matching_prefix(self, test_repl: _REPL) -> None:
+        """Test commands matching the typed prefix are offered."""
+        for name in ["/help", "/History", "/quit"]:
+            test_repl.command(name)(_noop)
+
+        assert self._complete(test_repl, "/h") == ["help", "History"]
+        assert self._complete(test_repl, "/HI") == ["History"]
+        assert self._complete(test_repl, "/") == ["help", "History", "quit"]
+
+    def test_no_completions_without_slash(self, test_repl: _REPL) -> None:
+        """Test plain input and empty input get no completions."""
+        test_repl.command("/help")(_noop)
+
+        assert self._complete(test_repl, "help") == []
+        assert self._complete(test_repl, "") == []
+
+    def test_completions_in_registration_order(self, test_repl: _REPL) -> None:
+        """Test completions come back in the order commands were registered."""
+        for name in ["/zeta", "/alphabet", "/Beta", "/alpha"]:
+            test_repl.command(name)(_noop)
+        # Replacing a command keeps its place
+        test_repl.command("/ZETA")(_noop)
+
+        assert self._complete(test_repl, "/") == ["ZETA", "alphabet", "Beta", "alpha"]
+        assert self._complete(test_repl, "/alp") == ["alphabet", "alpha"]
+        assert self._complete(test_repl, "/c") == []
+
+    def test_reregistered_command_listed_once(self, test_repl: _REPL) -> None:
+        """Test registering a name twice keeps a single completion."""
+        test_repl.command("/help")(_noop)
+        test_repl.command("/help")(_noop)
+
+        assert self._complete(test_repl, "/he") == ["help"]
+
+
+class TestHandleInput:
+    """Tests for dispatching submitted input."""
+
+    async def test_command_args_split(self, test_repl: _REPL) -> None:
+        """Test command name and arguments are separated on any whitespace."""
+        received: list[str] = []
+
+        @test_repl.command("/echo")
+        async def echo(args: str) -> None:
+            received.append(args)
+
+        await test_repl._handle_input("/ECHO  hello world")
+        await test_repl._handle_input("/echo\nline two")
+        await test_repl._handle_input("/echo")
+        assert received == ["hello world", "line two", ""]
+
+
+class TestInputQueue:
+    """Tests for input queued during cancellation."""
+
+    def test_full_queue_drops_oldest(self, test_repl: _REPL, reset_global_ui: None) -> None:
+        """Test overflowing the queue keeps the newest input and warns once."""
+        printed: list[object] = []
+        output = OutputManager()
+        output.print = printed.append  # type: ignore[method-assign]
+        ui._bind(output)
+
+        for i in range(_MAX_QUEUED_INPUT + 2):
+            test_repl._queue_input(f"input {i}")
+
+        assert test_repl._input_queue.qsize() == _MAX_QUEUED_INPUT
+        assert test_repl._input_queue.get_nowait() == "input 2"
+        assert len(printed) == 1
+
+    async def test_queued_input_processed_in_order(self, test_repl: _REPL) -> None:
+        """Test queued input runs after the submitted input, oldest first."""
+        received: list[str] = []
+
+        states: set[str] = set()
+
+        @test_repl.on_input
+        async def handler(text: str) -> None:
+            received.append(text)
+            states.add(test_repl._state)
+
+        for text in ["b", "c"]:
+            test_repl._queue_input(text)
+        await test_repl._run_inputs("a")
+
+        assert received == ["a", "b", "c"]
+        assert states == {"handling"}
+        assert test_repl._input_queue.empty()
+        assert test_repl._state == "idle"
+
+
 class TestInputHandler:
     """Tests for input handler registration."""
 
@@ -167,6 +278,7 @@ class TestPrompt:
         """Test setting prompt."""
         test_repl.prompt = ">>> "
         assert test_repl.prompt == ">>> "
+        assert test_repl._get_prompt_ft() == [("class:prompt", ">>> ")]
 
 
 class TestReset:
@@ -203,6 +315,13 @@ class TestReset:
         test_repl._reset()
         assert test_repl.prompt == "> "
 
+    def test_reset_returns_to_idle(self, test_repl: _REPL) -> None:
+        """Test reset leaves the REPL idle after an interrupted cancel."""
+        test_repl._set_state("handling")
+        test_repl._set_state("cancelling")
+        test_repl._reset()
+        assert test_repl._state == "idle"
+
 
 class TestCommand:
     """Tests for _Command dataclass."""
@@ -221,3 +340,43 @@ class TestCommand:
         assert cmd.name == "/test"
         assert cmd.handler == handler
         assert cmd.description == "Test command"
+
+
+class TestEventLoop:
+    """Tests for event loop selection."""
+
+    def test_run_event_loop_runs_coroutine(self) -> None:
+        """Test the coroutine runs to completion on whichever loop is chosen."""
+        ran = []
+
+        async def main() -> None:
+            await asyncio.sleep(0)
+            ran.append(True)
+
+        _run_event_loop(main())
+        assert ran == [True]
+
+
+class TestBoundedHistory:
+    """Tests for _BoundedHistory."""
+
+    def test_keeps_most_recent_entries(self) -> None:
+        """Test oldest entries are dropped once the limit is reached."""
+        history = _BoundedHistory(max_size=3)
+        for text in ["a", "b", "c", "d", "e"]:
+            history.store_string(text)
+        assert list(history.load_history_strings()) == ["e", "d", "c"]
+
+
+class TestSyncOutput:
+    """Tests for synchronized-update output."""
+
+    def test_flush_wraps_frame_in_sync_markers(self) -> None:
+        """Test each flush is written once, wrapped in DEC 2026 begin/end."""
+        stdout = io.StringIO()
+        output = _SyncVt100Output(stdout, lambda: Size(rows=24, columns=80))
+        output.write_raw("one")
+        output.write_raw("two")
+        output.flush()
+        output.flush()
+        assert stdout.getvalue() == "\x1b[?2026honetwo\x1b[?2026l"
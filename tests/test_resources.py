@@ -10,39 +10,88 @@ from __future__ import annotations
 
 import asyncio
 import gc
+from unittest.mock import MagicMock
 
 import pytest
 
+from nicerepl._ui import _GroupContext, _StatusContext
+from nicerepl.styles import SPINNER_FRAMES
+
 
 class TestTaskCleanup:
     """Verify async tasks are properly cleaned up."""
 
     async def test_status_animation_task_cancelled(self, test_ui):
-        """Status animation task should be cancelled on exit."""
+        """Status animation should be unregistered on exit."""
+        test_ui._out.set_invalidate_callback(lambda: None)
         with test_ui.status("Working..."):
-            # Animation task is running
+            # Animation timer is running
             await asyncio.sleep(0.1)
 
-        # Give time for task cancellation
-        await asyncio.sleep(0.05)
-
-        # No lingering animation tasks
-        for task in asyncio.all_tasks():
-            coro_name = str(task.get_coro())
-            assert "_animate" not in coro_name, f"Orphaned animation task: {coro_name}"
+        # No lingering animation or frame timer
+        assert not test_ui._animations
+        assert test_ui._animator_handle is None
 
     async def test_group_animation_task_cancelled(self, test_ui):
-        """Group animation task should be cancelled on exit."""
+        """Group animation should be unregistered on exit."""
+        test_ui._out.set_invalidate_callback(lambda: None)
         with test_ui.group("Test") as g:
             t = g.task("Task")
             await asyncio.sleep(0.1)
             t.success()
 
-        await asyncio.sleep(0.05)
-
-        for task in asyncio.all_tasks():
-            coro_name = str(task.get_coro())
-            assert "_animate" not in coro_name, f"Orphaned animation task: {coro_name}"
+        assert not test_ui._animations
+        assert test_ui._animator_handle is None
+
+    async def test_nested_animations_share_one_timer(self, test_ui):
+        """Nested status and group contexts should share a single animator timer."""
+        test_ui._out.set_invalidate_callback(lambda: None)
+        with test_ui.status("Outer"):
+            handle = test_ui._animator_handle
+            assert handle is not None
+            with test_ui.group("Inner") as g:
+                g.task("Task")
+                assert test_ui._animator_handle is handle
+                assert len(test_ui._animations) == 2
+            assert test_ui._animator_handle is not None
+
+        assert test_ui._animator_handle is None
+        assert handle.cancelled()
+
+    async def test_nested_animations_set_live_once_per_frame(self, test_ui):
+        """Each frame sets live content once, from the innermost animating context."""
+        test_ui._out.set_invalidate_callback(lambda: None)
+        with test_ui.status("Outer"), test_ui.group("Inner") as g:
+            g.task("Task")
+            set_live = MagicMock()
+            test_ui._out.set_live = set_live
+            start = test_ui._animator_frame
+            await asyncio.sleep(0.2)
+            frames = (test_ui._animator_frame - start) % len(SPINNER_FRAMES)
+            assert frames > 0
+            assert set_live.call_count == frames
+
+        assert all("Inner" in call.args[0].plain for call in set_live.call_args_list)
+
+    async def test_animator_waits_for_display(self, test_ui):
+        """No spinner timer runs until something displays live content."""
+        ticks = []
+
+        def tick() -> None:
+            ticks.append(test_ui._animator_frame)
+
+        test_ui._add_animation(tick)
+        try:
+            await asyncio.sleep(0.2)
+            assert test_ui._animator_handle is None
+            assert ticks == []
+
+            test_ui._out.set_invalidate_callback(lambda: None)
+            test_ui._start_animator()
+            await asyncio.sleep(0.2)
+            assert ticks
+        finally:
+            test_ui._remove_animation(tick)
 
     async def test_cancel_scope_has_task_reference(self, test_ui):
         """CancelScope should have task reference during context."""
@@ -63,9 +112,9 @@ class TestTaskCleanup:
 
         for i in range(10):
             with test_ui.status(f"Task {i}"):
-                await asyncio.sleep(0.02)
+                await asyncio.sleep(0)
 
-        await asyncio.sleep(0.1)
+        await asyncio.sleep(0)
         final_tasks = len(asyncio.all_tasks())
 
         # Should have same number of tasks (allow 1 for test framework)
@@ -77,10 +126,10 @@ class TestTaskCleanup:
 
         for _ in range(5):
             with pytest.raises(ValueError), test_ui.status("Working..."):
-                await asyncio.sleep(0.02)
+                await asyncio.sleep(0)
                 raise ValueError("Test")
 
-        await asyncio.sleep(0.1)
+        await asyncio.sleep(0)
         final_tasks = len(asyncio.all_tasks())
         assert final_tasks <= initial_tasks + 1
 
@@ -90,9 +139,6 @@ class TestMemoryBounds:
 
     async def test_repeated_context_managers_no_leak(self, test_ui):
         """Repeated context manager usage should not leak."""
-        gc.collect()
-        initial_objects = len(gc.get_objects())
-
         for _ in range(100):
             with test_ui.status("Test"):
                 await asyncio.sleep(0)
@@ -101,12 +147,11 @@ class TestMemoryBounds:
             with test_ui.group("Test") as g:
                 await g.success("Done")
 
+        del g
         gc.collect()
-        final_objects = len(gc.get_objects())
-
-        # Allow some growth but flag massive leaks (>10000 objects)
-        growth = final_objects - initial_objects
-        assert growth < 10000, f"Excessive object growth: {growth}"
+        context_types = (_StatusContext, _GroupContext)
+        leaked = sum(isinstance(obj, context_types) for obj in gc.get_objects())
+        assert not leaked, f"{leaked} contexts still alive"
 
     async def test_repeated_cancelable_no_state_leak(self, test_ui):
         """Repeated cancelable contexts should not leak state."""
@@ -123,21 +168,26 @@ class TestMemoryBounds:
 
     @pytest.mark.slow
     async def test_long_session_memory_stable(self, test_ui):
-        """Simulate long session - memory should stay bounded."""
-        import tracemalloc
+        """Simulate long session - live object count should stay bounded."""
+
+        async def session(count: int) -> None:
+            for i in range(count):
+                async with test_ui.cancelable():
+                    with test_ui.status(f"Task {i}"):
+                        await asyncio.sleep(0)
 
-        tracemalloc.start()
+        # Warm up caches so only per-iteration growth is measured
+        await session(10)
+        gc.collect()
+        before = len(gc.get_objects())
 
-        for i in range(500):
-            async with test_ui.cancelable():
-                with test_ui.status(f"Task {i}"):
-                    await asyncio.sleep(0)
+        await session(500)
 
-        current, peak = tracemalloc.get_traced_memory()
-        tracemalloc.stop()
+        gc.collect()
+        growth = len(gc.get_objects()) - before
 
-        # Fail if using more than 50MB (generous bound)
-        assert current < 50 * 1024 * 1024, f"Memory: {current / 1024 / 1024:.1f}MB"
+        # Anything retained per iteration would add at least 500 objects
+        assert growth < 500, f"{growth} objects retained"
 
     @pytest.mark.slow
     async def test_groups_with_many_tasks_cleanup(self, test_ui):
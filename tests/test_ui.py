@@ -3,7 +3,9 @@
 from __future__ import annotations
 
 import asyncio
-from unittest.mock import MagicMock
+import tracemalloc
+from collections.abc import Callable
+from unittest.mock import Mock
 
 import pytest
 
@@ -11,7 +13,6 @@ from nicerepl._output import OutputManager
 from nicerepl._ui import (
     _UI,
     CancelScope,
-    _CancelableState,
 )
 
 
@@ -33,119 +34,110 @@ class TestUIBinding:
         """Test mode is idle by default."""
         assert test_ui.mode == "idle"
 
-    def test_reset_clears_state(self, test_ui: _UI) -> None:
+    async def test_cancel_scope_follows_state(
+        self, cancelable_ui: _UI, cancelled_scope: CancelScope
+    ) -> None:
+        """Test the active scope is set along with the cancelable state."""
+        assert cancelable_ui._cancel_scope is cancelled_scope
+        with cancelable_ui.group("Work") as g, pytest.raises(asyncio.CancelledError):
+            await g.success("Done")
+
+    def test_reset_clears_state(self, cancelable_ui: _UI) -> None:
         """Test reset clears UI state."""
-        test_ui._state = _CancelableState(scope=CancelScope())
-        test_ui._reset()
-        assert test_ui._state is None
-        assert test_ui._output is None
+        cancelable_ui._reset()
+        assert cancelable_ui._state is None
+        assert cancelable_ui._output is None
 
 
 class TestCancelScope:
     """Tests for CancelScope."""
 
-    def test_initial_state(self) -> None:
+    def test_initial_state(self, scope: CancelScope) -> None:
         """Test initial cancelled state is False."""
-        scope = CancelScope()
         assert not scope.cancelled
 
-    def test_cancel_sets_flag(self) -> None:
+    def test_cancel_sets_flag(self, scope: CancelScope) -> None:
         """Test cancel sets cancelled flag."""
-        scope = CancelScope()
         scope.cancel()
         assert scope.cancelled
 
-    @pytest.mark.asyncio
-    async def test_checkpoint_raises_when_cancelled(self) -> None:
+    async def test_checkpoint_raises_when_cancelled(self, cancelled_scope: CancelScope) -> None:
         """Test checkpoint raises CancelledError when cancelled."""
-        scope = CancelScope()
-        scope.cancel()
         with pytest.raises(asyncio.CancelledError):
-            await scope.checkpoint()
+            await cancelled_scope.checkpoint()
 
-    @pytest.mark.asyncio
-    async def test_checkpoint_passes_when_not_cancelled(self) -> None:
+    async def test_checkpoint_passes_when_not_cancelled(self, scope: CancelScope) -> None:
         """Test checkpoint passes when not cancelled."""
-        scope = CancelScope()
         await scope.checkpoint()  # Should not raise
 
-    @pytest.mark.asyncio
-    async def test_sleep_raises_when_cancelled(self) -> None:
+    async def test_checkpoint_fast_path_retains_nothing(self, scope: CancelScope) -> None:
+        """Test uncancelled checkpoints do not accumulate memory."""
+        await scope.checkpoint()  # Warm up
+        tracemalloc.start()
+        try:
+            before = tracemalloc.get_traced_memory()[0]
+            for _ in range(1000):
+                await scope.checkpoint()
+            growth = tracemalloc.get_traced_memory()[0] - before
+        finally:
+            tracemalloc.stop()
+        assert growth < 10_000, f"Checkpoints retained {growth} bytes"
+
+    async def test_sleep_raises_when_cancelled(self, cancelled_scope: CancelScope) -> None:
         """Test sleep raises immediately when already cancelled."""
-        scope = CancelScope()
-        scope.cancel()
         with pytest.raises(asyncio.CancelledError):
-            await scope.sleep(10)
+            await cancelled_scope.sleep(10)
 
-    @pytest.mark.asyncio
-    async def test_sleep_completes_normally(self) -> None:
+    async def test_sleep_completes_normally(self, scope: CancelScope) -> None:
         """Test sleep completes when not cancelled."""
-        scope = CancelScope()
         await scope.sleep(0.01)  # Should complete
 
-    @pytest.mark.asyncio
-    async def test_sleep_interrupted_by_cancel(self) -> None:
+    async def test_sleep_interrupted_by_cancel(self, scope: CancelScope) -> None:
         """Test sleep is interrupted by cancel."""
-        scope = CancelScope()
-
-        async def cancel_after_delay():
-            await asyncio.sleep(0.05)
-            scope.cancel()
-
-        task = asyncio.create_task(cancel_after_delay())
+        asyncio.get_running_loop().call_soon(scope.cancel)
 
         with pytest.raises(asyncio.CancelledError):
             await scope.sleep(10)  # Would take forever, but cancel interrupts
 
+    async def test_sleep_task_cancelled_cleans_up(self, scope: CancelScope) -> None:
+        """Test cancelling the sleeping task leaves no pending waiter behind."""
+        task = asyncio.create_task(scope.sleep(10))
+        await asyncio.sleep(0)
+        assert len(scope._sleepers) == 1
+
         task.cancel()
-        try:
+        with pytest.raises(asyncio.CancelledError):
             await task
-        except asyncio.CancelledError:
-            pass
+        assert not scope._sleepers
+        assert not scope.cancelled
 
 
 class TestUIOutputMethods:
     """Tests for UI output methods."""
 
-    def test_print_calls_output(self, test_ui: _UI, output_manager: OutputManager) -> None:
-        """Test print delegates to output manager."""
-        # Mock the print method
-        output_manager.print = MagicMock()
-        test_ui.print("Hello")
-        output_manager.print.assert_called_once()
-
-    def test_echo_formats_with_prefix(self, test_ui: _UI, output_manager: OutputManager) -> None:
-        """Test echo adds prefix."""
-        output_manager.print = MagicMock()
-        test_ui.echo("test input")
-        output_manager.print.assert_called_once()
-        # Check the call included the text
-        call_arg = output_manager.print.call_args[0][0]
-        assert "test input" in str(call_arg)
-
-    def test_success_prints_message(self, test_ui: _UI, output_manager: OutputManager) -> None:
-        """Test success prints with checkmark."""
-        output_manager.print = MagicMock()
-        test_ui.success("Done!")
-        output_manager.print.assert_called_once()
-
-    def test_error_prints_message(self, test_ui: _UI, output_manager: OutputManager) -> None:
-        """Test error prints with X."""
-        output_manager.print = MagicMock()
-        test_ui.error("Failed!")
-        output_manager.print.assert_called_once()
-
-    def test_warning_prints_message(self, test_ui: _UI, output_manager: OutputManager) -> None:
-        """Test warning prints with triangle."""
-        output_manager.print = MagicMock()
-        test_ui.warning("Careful!")
-        output_manager.print.assert_called_once()
-
-    def test_info_prints_message(self, test_ui: _UI, output_manager: OutputManager) -> None:
-        """Test info prints with i."""
-        output_manager.print = MagicMock()
-        test_ui.info("Note:")
-        output_manager.print.assert_called_once()
+    @pytest.mark.parametrize(
+        ("method", "text"),
+        [
+            ("print", "Hello"),
+            ("echo", "test input"),
+            ("success", "Done!"),
+            ("error", "Failed!"),
+            ("warning", "Careful!"),
+            ("info", "Note:"),
+        ],
+    )
+    def test_output_delegates(
+        self,
+        test_ui: _UI,
+        mocked_output: OutputManager,
+        last_printed: Callable[[], str],
+        method: str,
+        text: str,
+    ) -> None:
+        """Test each output method prints its text once through the output manager."""
+        getattr(test_ui, method)(text)
+        mocked_output.print.assert_called_once()
+        assert text in last_printed()
 
 
 class TestRequestCancel:
@@ -155,14 +147,22 @@ class TestRequestCancel:
         """Test request_cancel returns False when idle."""
         assert not test_ui.request_cancel()
 
-    def test_request_cancel_when_cancelable(self, test_ui: _UI) -> None:
+    def test_request_cancel_when_cancelable(self, cancelable_ui: _UI, scope: CancelScope) -> None:
         """Test request_cancel cancels scope when in cancelable state."""
-        scope = CancelScope()
-        test_ui._state = _CancelableState(scope=scope)
-
-        assert test_ui.request_cancel()
+        assert cancelable_ui.request_cancel()
         assert scope.cancelled
 
+    def test_repeat_request_cancel_redraws_once(
+        self, cancelable_ui: _UI, mocked_output: OutputManager
+    ) -> None:
+        """Test repeated requests for the same scope only show the footer once."""
+        mocked_output.force_invalidate = Mock(spec=OutputManager.force_invalidate)  # type: ignore[method-assign]
+
+        assert cancelable_ui.request_cancel()
+        assert cancelable_ui.request_cancel()
+        mocked_output.set_live_footer.assert_called_once()
+        mocked_output.force_invalidate.assert_called_once()
+
     def test_request_cancel_strict_raises(self, test_ui: _UI) -> None:
         """Test request_cancel with strict=True raises when idle."""
         with pytest.raises(RuntimeError, match="Nothing to cancel"):
@@ -181,40 +181,56 @@ class TestRespondConfirm:
         with pytest.raises(RuntimeError, match="No pending confirm"):
             test_ui.respond_confirm(True, strict=True)
 
+    async def test_first_response_wins(self, test_ui: _UI) -> None:
+        """Test the pending confirm resolves with the first response only."""
+        confirm = asyncio.ensure_future(test_ui.confirm("Proceed?"))
+        await asyncio.sleep(0)
+
+        assert test_ui.respond_confirm(False)
+        assert test_ui.respond_confirm(True)
+        assert await confirm is False
+        assert test_ui._state is None
+
 
 class TestCollapsed:
     """Tests for collapsed output."""
 
-    def test_collapsed_title_only(self, test_ui: _UI, output_manager: OutputManager) -> None:
-        """Test collapsed with max_chars=0 shows only title."""
-        output_manager.print = MagicMock()
-        test_ui.collapsed("Title", "Long content here\nLine 2\nLine 3")
-        output_manager.print.assert_called_once()
-        call_arg = str(output_manager.print.call_args[0][0])
-        assert "Title" in call_arg
-        assert "3 lines" in call_arg
-
-    def test_collapsed_with_preview(self, test_ui: _UI, output_manager: OutputManager) -> None:
-        """Test collapsed with max_chars shows preview."""
-        output_manager.print = MagicMock()
-        test_ui.collapsed("Title", "A" * 200, max_chars=50)
-        output_manager.print.assert_called_once()
-        call_arg = str(output_manager.print.call_args[0][0])
-        assert "Title" in call_arg
-        assert "more chars" in call_arg
-
-    def test_collapsed_full_content(self, test_ui: _UI, output_manager: OutputManager) -> None:
-        """Test collapsed with max_chars=None shows full content."""
-        output_manager.print = MagicMock()
-        test_ui.collapsed("Title", "Full content here", max_chars=None)
-        output_manager.print.assert_called_once()
-        call_arg = str(output_manager.print.call_args[0][0])
-        assert "Full content here" in call_arg
-
-    def test_thinking_uses_collapsed(self, test_ui: _UI, output_manager: OutputManager) -> None:
+    @pytest.mark.parametrize(
+        ("content", "max_chars", "expected"),
+        [
+            ("Long content here\nLine 2\nLine 3", 0, ["Title", "3 lines"]),
+            ("A" * 200, 50, ["Title", "more chars"]),
+            ("Full content here", None, ["Full content here"]),
+        ],
+        ids=["title_only", "preview", "full_content"],
+    )
+    def test_collapsed_renders(
+        self,
+        test_ui: _UI,
+        mocked_output: OutputManager,
+        last_printed: Callable[[], str],
+        content: str,
+        max_chars: int | None,
+        expected: list[str],
+    ) -> None:
+        """Test collapsed output for each truncation mode."""
+        test_ui.collapsed("Title", content, max_chars=max_chars)
+        mocked_output.print.assert_called_once()
+        output = last_printed()
+        missing = [text for text in expected if text not in output]
+        assert not missing, missing
+
+    def test_collapsed_line_count_ignores_surrounding_whitespace(
+        self, test_ui: _UI, last_printed: Callable[[], str]
+    ) -> None:
+        """Test the line count matches the stripped content."""
+        test_ui.collapsed("Title", "\n\n  Line 1\n\nLine 3 \n \t\n")
+        assert "(3 lines)" in last_printed()
+
+    def test_thinking_uses_collapsed(
+        self, test_ui: _UI, mocked_output: OutputManager, last_printed: Callable[[], str]
+    ) -> None:
         """Test thinking delegates to collapsed."""
-        output_manager.print = MagicMock()
         test_ui.thinking("Reasoning here")
-        output_manager.print.assert_called_once()
-        call_arg = str(output_manager.print.call_args[0][0])
-        assert "Thinking" in call_arg
+        mocked_output.print.assert_called_once()
+        assert "Thinking" in last_printed()